@@ -1,13 +1,17 @@
 import os
-from typing import Optional
+from typing import Optional, Union
 from dotenv import load_dotenv
 import base64
 from pathlib import Path
 
-# LangChain Models
-from langchain_community.chat_models import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
+from ..utils.executors import run_blocking_io, run_inference
+# LangChain Models (pooled, see app/utils/llm_clients.py)
+from ..utils.llm_clients import llm_clients
+from .product_recognition import decode_barcodes, product_answer_cache, product_lookup
+from ..utils.frame import Frame
+from ..utils.frame_cache import frame_dhash, vision_frame_cache
+from ..utils.image_prep import prepare_frame_for_llm
+from ..utils.semantic_cache import qa_response_cache
 
 # Load env vars - ensure we load from the correct .env file
 # Find the .env file in the parent directory of this module
@@ -18,10 +22,13 @@ load_dotenv(dotenv_path=env_path)
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
+# Missing keys are reported rather than raised at import, so importing this
+# module (e.g. during app warm-up) never takes the whole service down;
+# get_llm() still refuses the Groq provider without its key.
 if not GOOGLE_API_KEY:
-    raise ValueError("GOOGLE_API_KEY is not set. Please add it to your .env file.")
+    print("⚠️  GOOGLE_API_KEY is not set. Please add it to your .env file.")
 if not GROQ_API_KEY:
-    raise ValueError("GROQ_API_KEY is not set. Please add it to your .env file.")
+    print("⚠️  GROQ_API_KEY is not set. Please add it to your .env file.")
 
 # Prompt Templates
 TEXT_RECOGNITION_PROMPT = """
@@ -94,12 +101,11 @@ Expected output:
 
 def get_llm(provider: str):
     if provider == "openai":
-        return ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
+        return llm_clients.chat_model("openai", "gpt-4o-mini", temperature=0.2)
     elif provider == "groq":
         if not GROQ_API_KEY:
             raise ValueError("GROQ_API_KEY is required for Groq provider")
-        print(f"[DEBUG] Initializing Groq with API key: {GROQ_API_KEY[:20]}...", flush=True)
-        return ChatGroq(model="llama3-8b-8192", groq_api_key=GROQ_API_KEY)
+        return llm_clients.chat_model("groq", "llama3-8b-8192")
     else:
         raise ValueError(f"Unsupported provider: {provider}")
 
@@ -119,87 +125,52 @@ def get_task_prompt(task: str) -> str:
     }
     return prompts.get(task, "Describe the image.")
 
-from typing import Optional
-
-
-import cv2
-from pyzbar.pyzbar import decode
-import numpy as np
-
-def extract_barcode_from_base64(base64_image: str):
-    image_bytes = base64.b64decode(base64_image)
-    image_np = np.frombuffer(image_bytes, dtype=np.uint8)
-    image = cv2.imdecode(image_np, cv2.IMREAD_COLOR)
-    
-    decoded_objects = decode(image)
-    barcodes = [obj.data.decode("utf-8") for obj in decoded_objects]
+def extract_barcodes(frame: Frame):
+    """Barcodes in the frame (multi-pass decode on its shared grayscale view)"""
+    barcodes = decode_barcodes(frame)
 
     print(barcodes)
     
     return barcodes  # could be a list of barcodes found
 
-import requests
-import json
+
+def extract_barcode_from_base64(base64_image: str):
+    return extract_barcodes(Frame.from_base64(base64_image))
+
 
 def fetch_book_main_info(isbn: str) -> Optional[dict]:
     """
-    Fetch and return only the main book information from Google Books API using ISBN.
+    Fetch and return only the main book information for an ISBN (cached, see product_recognition.py).
     """
-    url = f"https://www.googleapis.com/books/v1/volumes?q=isbn:{isbn}"
-    response = requests.get(url)
-
-    if response.status_code != 200:
-        print(f"Error: Failed to fetch data (status {response.status_code})")
-        return None
-
-    data = response.json()
-    print(data)
-    if not data.get("items"):
-        print("No book found with this ISBN.")
-        with open("sample_product.json", "r") as f:
-            data = json.load(f)
-
-    print(data)
-
-    volume_info = data["items"][0]["volumeInfo"]
-
-    # Extract clean, minimal fields
-    result = {
-        "title": volume_info.get("title"),
-        "authors": volume_info.get("authors", []),
-        "publishedDate": volume_info.get("publishedDate"),
-        "isbn_13": None,
-        "thumbnail": volume_info.get("imageLinks", {}).get("thumbnail"),
-    }
+    return product_lookup.lookup(isbn)
 
-    # Extract ISBN-13
-    for identifier in volume_info.get("industryIdentifiers", []):
-        if identifier["type"] == "ISBN_13":
-            result["isbn_13"] = identifier["identifier"]
 
-    return result
+def product_query(barcodes, book_info: Optional[dict]) -> str:
+    """What the LLM is asked to reformat for a product scan"""
+    if barcodes and len(barcodes) > 0:
+        if book_info:
+            print(f"[DEBUG] Book info: {book_info}")
+            return "Reformat the following product information: " + "\n".join(f"{key}: {value}" for key, value in book_info.items())
+        return "No product information found for this barcode."
+    return "No barcode detected in the image. Please describe what you see in the image."
 
 
-def get_llm_response(query: str, task: str, base64_image: Optional[str] = None, provider: str = "openai"):
-    llm = get_llm(provider)
+def build_task_messages(query: str, task: str, base64_image: Union[str, Frame, None] = None):
+    """Chat messages for a task (blocking: images are downscaled/re-encoded for the task,
+    and product recognition decodes the barcode and looks it up)"""
     prompt = get_task_prompt(task)
+    frame = Frame.coerce(base64_image)
 
-    if task == "product_recognition" and base64_image:
-        barcodes = extract_barcode_from_base64(base64_image)
+    if task == "product_recognition" and frame:
+        barcodes = extract_barcodes(frame)
         print(f"[DEBUG] Barcodes found: {barcodes}")
-        if barcodes and len(barcodes) > 0:
-            book_info = fetch_book_main_info(barcodes[0])
-            if book_info:
-                query = "Reformat the following product information: " + "\n".join(f"{key}: {value}" for key, value in book_info.items())
-                print(f"[DEBUG] Book info: {book_info}")
-            else:
-                query = "No product information found for this barcode."
-        else:
-            query = "No barcode detected in the image. Please describe what you see in the image."
-        
-
-    if task != "product_recognition" and base64_image:
-        image_url = f"data:image/jpeg;base64,{base64_image}"
+        book_info = fetch_book_main_info(barcodes[0]) if barcodes else None
+        query = product_query(barcodes, book_info)
+
+
+    if task != "product_recognition" and frame:
+        encoded_image, image_mime = prepare_frame_for_llm(frame, task)
+        image_url = f"data:{image_mime};base64,{encoded_image}"
         messages = [
             {"role": "system", "content": prompt},
             {"role": "user", "content": [{"type": "image_url", "image_url": {"url": image_url}}]}
@@ -210,11 +181,168 @@ def get_llm_response(query: str, task: str, base64_image: Optional[str] = None,
             {"role": "system", "content": prompt},
             {"role": "user", "content": query}
         ]
+
+    return messages
+
+
+async def ascan_product(frame: Frame):
+    """(barcodes, product info for the first one) for a product scan"""
+    # Decode off the event loop; the lookup is a cache read or an async HTTP call
+    barcodes = await run_blocking_io(extract_barcodes, frame)
+    print(f"[DEBUG] Barcodes found: {barcodes}")
+    book_info = await product_lookup.alookup(barcodes[0]) if barcodes else None
+    return barcodes, book_info
+
+
+async def abuild_task_messages(query: str, task: str, frame: Optional[Frame] = None, product=None):
+    """`product` is the scan from ascan_product, if the caller already has it"""
+    if task == "product_recognition" and frame:
+        barcodes, book_info = product if product is not None else await ascan_product(frame)
+        return build_task_messages(product_query(barcodes, book_info), task)
+    if frame:
+        # Image preparation is CPU work; keep it off the event loop
+        return await run_blocking_io(build_task_messages, query, task, frame)
+    return build_task_messages(query, task)
+
+
+def get_llm_response(query: str, task: str, base64_image: Union[str, Frame, None] = None, provider: str = "openai"):
+    """Synchronous entry point (scripts such as test_pipeline.py)"""
+    llm = get_llm(provider)
+    messages = build_task_messages(query, task, base64_image)
     
     response = llm.invoke(messages)
     
     return response.content.strip()
 
+
+# Text-only tasks whose answers are reused for near-identical questions
+SEMANTIC_CACHE_TASKS = {"general_question_answering"}
+# Camera tasks answered again for a near-identical frame of the same scene.
+# Distance guidance is never reused (the user moves between frames) and product
+# answers are cached per decoded barcode (product_answer_cache) instead.
+FRAME_CACHE_TASKS = {
+    "text_recognition",
+    "image_captioning",
+    "currency_detection",
+}
+
+
+async def lookup_cached_answer(query: str, task: str, frame: Optional[Frame] = None, product=None):
+    """Check the response caches.
+
+    Returns (answer, remember): `answer` is the cached answer or None, and
+    `remember(answer)` records a freshly generated one (None if the request
+    is not cacheable or was a hit). `product` is the request's ascan_product
+    result for product scans.
+    """
+    if product is not None:
+        barcodes, book_info = product
+        # Failed lookups are retried by the next scan, so their answers are not kept
+        if not book_info or product_answer_cache.maxsize <= 0:
+            return None, None
+        answer = product_answer_cache.get(barcodes[0])
+        if answer is not None:
+            print(f"✅ Product answer cache hit for {barcodes[0]}")
+            return answer, None
+
+        async def remember(answer):
+            if answer:
+                product_answer_cache.put(barcodes[0], answer)
+        return None, remember
+
+    if frame:
+        if task not in FRAME_CACHE_TASKS or not vision_frame_cache.enabled:
+            return None, None
+        frame_hash = await run_blocking_io(frame_dhash, frame)
+        if frame_hash is None:
+            return None, None
+        answer = vision_frame_cache.lookup(task, query, frame_hash)
+        if answer is not None:
+            print(f"✅ Frame cache hit for {task}")
+            return answer, None
+
+        async def remember(answer):
+            vision_frame_cache.store(task, query, frame_hash, answer)
+        return None, remember
+
+    if task not in SEMANTIC_CACHE_TASKS or not qa_response_cache.enabled:
+        return None, None
+    # Embedding the question is model inference; share the inference pool with routing.
+    # The cache is an optimisation: if the embedder or its store fails, answer uncached.
+    try:
+        lookup = await run_inference(qa_response_cache.lookup, query)
+    except Exception as e:
+        print(f"⚠️  QA cache lookup failed, answering uncached: {type(e).__name__}: {e}")
+        return None, None
+    if lookup.answer is not None:
+        print(f"✅ QA cache hit (similarity {lookup.similarity:.3f})")
+        return lookup.answer, None
+
+    async def remember(answer):
+        try:
+            await run_blocking_io(qa_response_cache.store, query, answer, lookup.vector)
+        except Exception as e:
+            print(f"⚠️  Could not store QA answer in the cache: {type(e).__name__}: {e}")
+    return None, remember
+
+
+async def aget_llm_response(
+    query: str,
+    task: str,
+    base64_image: Union[str, Frame, None] = None,
+    provider: str = "openai",
+    deadline_seconds: Optional[float] = None,
+):
+    """Async entry point for the API: awaits the provider without holding a thread.
+
+    Calls are limited per provider and bounded by `deadline_seconds`
+    (see llm_clients.call); TimeoutError is raised when the deadline passes.
+    """
+    frame = Frame.coerce(base64_image)
+    product = await ascan_product(frame) if task == "product_recognition" and frame else None
+    cached, remember = await lookup_cached_answer(query, task, frame, product)
+    if cached is not None:
+        return cached
+
+    llm = get_llm(provider)
+    messages = await abuild_task_messages(query, task, frame, product)
+
+    response = await llm_clients.call(provider, llm.ainvoke, messages, deadline_seconds=deadline_seconds)
+    answer = response.content.strip()
+
+    if remember is not None:
+        await remember(answer)
+    return answer
+
+
+async def astream_llm_response(
+    query: str,
+    task: str,
+    base64_image: Union[str, Frame, None] = None,
+    provider: str = "openai",
+    deadline_seconds: Optional[float] = None,
+):
+    """Like aget_llm_response, but yields the answer text chunk by chunk as it is generated"""
+    frame = Frame.coerce(base64_image)
+    product = await ascan_product(frame) if task == "product_recognition" and frame else None
+    cached, remember = await lookup_cached_answer(query, task, frame, product)
+    if cached is not None:
+        yield cached
+        return
+
+    llm = get_llm(provider)
+    messages = await abuild_task_messages(query, task, frame, product)
+
+    chunks = []
+    async for chunk in llm_clients.stream(provider, llm.astream(messages), deadline_seconds=deadline_seconds):
+        if chunk.content:
+            chunks.append(chunk.content)
+            yield chunk.content
+
+    # Only complete answers are cached
+    if remember is not None:
+        await remember("".join(chunks).strip())
+
 if __name__ == "__main__":
     # Example usage
     task = "image_captioning"
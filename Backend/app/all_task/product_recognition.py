@@ -0,0 +1,250 @@
+"""
+Product recognition: barcode decoding and ISBN / product lookup.
+
+Barcodes are decoded in increasingly expensive passes over the frame's
+grayscale view (full frame, downscaled copies, then regions of interest),
+stopping at the first pass that finds one.
+
+Lookups go through a local SQLite cache with a TTL, including "not found"
+answers (negative caching), so a repeat scan never reaches the network. Cache
+misses call the Google Books API with timeouts: asynchronously for the API,
+synchronously for scripts.
+"""
+import json
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from ..config import config
+from ..utils.cache import LRUCache
+from ..utils.executors import run_blocking_io
+from ..utils.sqlite_cache import SqliteCache
+
+GOOGLE_BOOKS_URL = "https://www.googleapis.com/books/v1/volumes"
+SAMPLE_PRODUCT_PATH = Path(__file__).parent.parent.parent / "sample_product.json"
+
+# Longest side of the downscaled passes; large noisy frames often decode better smaller
+BARCODE_DOWNSCALE_SIDES = (1280, 800)
+
+
+# ---------------------------
+# Barcode decoding
+# ---------------------------
+
+def _barcode_passes(gray):
+    """(name, image) candidates from cheapest to most expensive, built lazily"""
+    import cv2
+
+    yield "gray", gray
+
+    height, width = gray.shape[:2]
+    for max_side in BARCODE_DOWNSCALE_SIDES:
+        if max(height, width) > max_side:
+            scale = max_side / max(height, width)
+            yield f"downscale_{max_side}", cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    # People aim the camera at the product: try the centre, then a horizontal band,
+    # upscaled so small barcodes get enough pixels per bar
+    center = gray[height // 5: height - height // 5, width // 5: width - width // 5]
+    yield "roi_center", cv2.resize(center, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+    band = gray[height // 3: 2 * height // 3, :]
+    yield "roi_band", cv2.resize(band, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+
+
+class BarcodeStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.passes = {}  # pass name (or "none") -> frames it decoded
+
+    def record(self, name: str):
+        with self._lock:
+            self.passes[name] = self.passes.get(name, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.passes)
+
+
+barcode_stats = BarcodeStats()
+
+
+def decode_barcodes(frame) -> list[str]:
+    """Barcode values in the frame, from the first decoding pass that finds any (blocking)"""
+    from pyzbar.pyzbar import decode
+
+    for name, image in _barcode_passes(frame.gray):
+        decoded_objects = decode(image)
+        if decoded_objects:
+            barcode_stats.record(name)
+            return [obj.data.decode("utf-8") for obj in decoded_objects]
+    barcode_stats.record("none")
+    return []
+
+
+# ---------------------------
+# Product lookup
+# ---------------------------
+
+def parse_book_info(data: dict) -> Optional[dict]:
+    """Main book fields from a Google Books volumes response, or None if it has no items"""
+    if not data.get("items"):
+        return None
+    volume_info = data["items"][0]["volumeInfo"]
+
+    # Extract clean, minimal fields
+    result = {
+        "title": volume_info.get("title"),
+        "authors": volume_info.get("authors", []),
+        "publishedDate": volume_info.get("publishedDate"),
+        "isbn_13": None,
+        "thumbnail": volume_info.get("imageLinks", {}).get("thumbnail"),
+    }
+
+    # Extract ISBN-13
+    for identifier in volume_info.get("industryIdentifiers", []):
+        if identifier["type"] == "ISBN_13":
+            result["isbn_13"] = identifier["identifier"]
+
+    return result
+
+
+@lru_cache(maxsize=1)
+def sample_product() -> Optional[dict]:
+    """Demo product shown when a barcode is unknown (read from disk once)"""
+    with open(SAMPLE_PRODUCT_PATH, "r") as f:
+        return parse_book_info(json.load(f))
+
+
+class ProductLookupService:
+    def __init__(self, db_path: str, ttl_seconds: float, negative_ttl_seconds: float, timeout_seconds: float):
+        self._cache = SqliteCache(db_path, table="products")
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self._client = None
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.cache_hits = 0
+        self.negative_hits = 0
+        self.fetches = 0
+        self.fetch_errors = 0
+        self.fetch_seconds = 0.0
+
+    def _count(self, field: str, amount=1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    def _cached(self, isbn: str):
+        """(hit, info) from the local cache (blocking: SQLite read)"""
+        self._count("lookups")
+        entry = self._cache.get(isbn)
+        if entry is None:
+            return False, None
+        self._count("cache_hits")
+        if not entry["found"]:
+            self._count("negative_hits")
+        return True, entry["info"]
+
+    def _remember(self, isbn: str, data: dict):
+        info = parse_book_info(data)
+        if info is None:
+            print(f"No book found with ISBN {isbn}.")
+            self._cache.set(isbn, {"found": False, "info": None}, ttl_seconds=self.negative_ttl_seconds)
+        else:
+            self._cache.set(isbn, {"found": True, "info": info}, ttl_seconds=self.ttl_seconds)
+        return info
+
+    def _result(self, info: Optional[dict]) -> Optional[dict]:
+        if info is None and config.PRODUCT_SAMPLE_FALLBACK:
+            return sample_product()
+        return info
+
+    def _fetched(self, isbn: str, seconds: float, response=None, error: Exception | None = None) -> Optional[dict]:
+        """Record a Google Books request and cache its answer (blocking: SQLite write).
+
+        `response` is a requests or httpx response; `error` is what the request raised.
+        """
+        self._count("fetches")
+        self._count("fetch_seconds", seconds)
+        if error is None:
+            try:
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                error = e
+        if error is not None:
+            # Not cached: the next scan retries
+            self._count("fetch_errors")
+            print(f"Error: Failed to fetch product data for {isbn}: {error}")
+            return None
+        return self._result(self._remember(isbn, data))
+
+    def lookup(self, isbn: str) -> Optional[dict]:
+        """Blocking lookup (scripts and the sync pipeline)"""
+        import requests
+
+        hit, info = self._cached(isbn)
+        if hit:
+            return self._result(info)
+
+        start = time.perf_counter()
+        try:
+            response = requests.get(GOOGLE_BOOKS_URL, params={"q": f"isbn:{isbn}"}, timeout=self.timeout_seconds)
+        except Exception as e:
+            return self._fetched(isbn, time.perf_counter() - start, error=e)
+        return self._fetched(isbn, time.perf_counter() - start, response)
+
+    def _http_client(self):
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(timeout=httpx.Timeout(self.timeout_seconds))
+        return self._client
+
+    async def alookup(self, isbn: str) -> Optional[dict]:
+        """Lookup for the API: SQLite access runs on the blocking-io pool, misses use async HTTP"""
+        hit, info = await run_blocking_io(self._cached, isbn)
+        if hit:
+            return self._result(info)
+
+        start = time.perf_counter()
+        try:
+            response = await self._http_client().get(GOOGLE_BOOKS_URL, params={"q": f"isbn:{isbn}"})
+        except Exception as e:
+            return await run_blocking_io(self._fetched, isbn, time.perf_counter() - start, error=e)
+        return await run_blocking_io(self._fetched, isbn, time.perf_counter() - start, response)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "cached_products": len(self._cache),
+                "lookups": self.lookups,
+                "cache_hits": self.cache_hits,
+                "negative_hits": self.negative_hits,
+                "hit_rate": round(self.cache_hits / self.lookups, 3) if self.lookups else 0.0,
+                "fetches": self.fetches,
+                "fetch_errors": self.fetch_errors,
+                "mean_fetch_ms": round(self.fetch_seconds * 1000 / self.fetches, 1) if self.fetches else 0.0,
+                "barcode_passes": barcode_stats.snapshot(),
+            }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+product_lookup = ProductLookupService(
+    db_path=config.PRODUCT_CACHE_DB_PATH,
+    ttl_seconds=config.PRODUCT_CACHE_TTL_SECONDS,
+    negative_ttl_seconds=config.PRODUCT_CACHE_NEGATIVE_TTL_SECONDS,
+    timeout_seconds=config.PRODUCT_LOOKUP_TIMEOUT_SECONDS,
+)
+
+# LLM descriptions of scanned products, keyed by barcode: the answer depends on
+# the product, not on how the frame looks (see all_task/pipeline.py)
+product_answer_cache = LRUCache(
+    config.FRAME_CACHE_SIZE if config.FRAME_CACHE_ENABLED else 0,
+    config.PRODUCT_ANSWER_CACHE_TTL_SECONDS or None,
+)
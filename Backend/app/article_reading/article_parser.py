@@ -0,0 +1,55 @@
+"""
+Article post-processing run in the CPU process pool.
+
+newspaper's parse and NLP are pure-Python and hold the GIL, so they run in
+worker processes (see run_cpu_bound). This module only imports newspaper,
+lazily, so spawned workers start quickly. Parsing no longer runs NLP: the
+summary is computed separately, only when a client asks for it, from the
+`body` kept alongside the parsed fields.
+"""
+
+# Characters of article text kept for summarizing later (the API returns the first 2000)
+SUMMARY_SOURCE_CHARS = 20000
+# newspaper's default summary length
+SUMMARY_SENTENCES = 5
+
+
+def parse_html(url: str, html: str, summarize: bool = False):
+    """Parsed article fields for `url`, or None if the page has no article text.
+
+    Keys: title, text, summary (None unless `summarize`), url, plus body and
+    language for summarize_text().
+    """
+    from newspaper import Article
+
+    article = Article(url)
+    article.download(input_html=html)
+    article.parse()
+    if not article.text.strip():
+        return None
+
+    fields = {
+        "title": article.title,
+        "text": article.text[:2000],
+        "summary": None,
+        "url": url,
+        "body": article.text[:SUMMARY_SOURCE_CHARS],
+        "language": article.config.get_language() or "en",
+    }
+    if summarize:
+        fields["summary"] = summarize_text(fields["title"], fields["body"], fields["language"])
+    return fields
+
+
+def summarize_text(title: str, text: str, language: str = "en") -> str:
+    """newspaper's extractive summary (what Article.nlp() produced); "" if NLTK data is missing"""
+    from newspaper import nlp
+
+    try:
+        nlp.load_stopwords(language)
+        return "\n".join(nlp.summarize(title=title, text=text, max_sents=SUMMARY_SENTENCES))
+    except LookupError as nltk_error:
+        print(f"⚠️ NLTK data missing, skipping summary: {nltk_error}")
+    except Exception as nlp_error:
+        print(f"⚠️ Summary failed: {nlp_error}")
+    return ""
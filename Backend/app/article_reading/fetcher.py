@@ -0,0 +1,250 @@
+"""
+Concurrent article fetching for the news pipeline.
+
+Candidate URLs are downloaded at the same time over one shared keep-alive
+httpx pool, with a global in-flight limit and a smaller limit per domain so a
+single site is never hammered. Every download has its own timeout (started
+once it gets a slot) and the fetch stage stops at the pipeline's deadline.
+newspaper's parse runs in the CPU process pool on the downloaded HTML. The
+first `limit` articles that succeed are returned and the remaining downloads
+are cancelled, so latency tracks the fastest sources.
+
+Parsed articles are kept in the on-disk news cache: fresh entries skip the
+network, stale ones are revalidated with a conditional GET, and concurrent
+requests for the same URL share one download.
+"""
+import asyncio
+import contextlib
+import ipaddress
+import socket
+import threading
+import time
+from typing import Callable
+from urllib.parse import urlsplit
+
+from ..config import config
+from ..utils.executors import run_blocking_io, run_cpu_bound
+from .news_cache import news_cache
+
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'
+)
+
+
+def domain_of(url: str) -> str:
+    host = urlsplit(url).hostname or ""
+    return host.removeprefix("www.")
+
+
+def is_public_http_url(url: str) -> bool:
+    """Whether `url` is http(s) on a host that only resolves to public addresses (blocking: DNS lookup)"""
+    parts = urlsplit(url)
+    try:
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            return False
+        addresses = socket.getaddrinfo(parts.hostname, parts.port, type=socket.SOCK_STREAM)
+    except (ValueError, OSError):
+        return False
+    return all(ipaddress.ip_address(address[4][0]).is_global for address in addresses)
+
+
+class ArticleFetcher:
+    def __init__(self, concurrency: int, per_domain: int, url_timeout_seconds: float, cache=None):
+        self.concurrency = concurrency
+        self.per_domain = per_domain
+        self.url_timeout_seconds = url_timeout_seconds
+        self.cache = cache
+        self._inflight = {}  # url -> [task, waiters]
+        self._client = None
+        self._semaphore = None
+        self._domains = {}  # domain -> [asyncio.Semaphore, downloads holding or waiting for it]
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.coalesced = 0
+        self.downloads = 0
+        self.parsed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.deadline_hits = 0
+        self.download_seconds = 0.0
+        self.parse_seconds = 0.0
+
+    def _count(self, field: str, amount=1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    def _http_client(self):
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                headers={"User-Agent": USER_AGENT},
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency,
+                ),
+                timeout=httpx.Timeout(self.url_timeout_seconds),
+            )
+        return self._client
+
+    @contextlib.asynccontextmanager
+    async def _domain_slot(self, url: str):
+        """One of the URL's domain slots; the domain's semaphore is dropped once nobody uses it"""
+        domain = domain_of(url)
+        slot = self._domains.get(domain)
+        if slot is None:
+            slot = self._domains[domain] = [asyncio.Semaphore(self.per_domain), 0]
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                yield
+        finally:
+            slot[1] -= 1
+            if slot[1] == 0:
+                del self._domains[domain]
+
+    async def download(self, url: str, headers: dict | None = None):
+        """Response for `url` within the global and per-domain limits and the per-URL timeout.
+
+        Error statuses raise, except 304 Not Modified, which answers a conditional request.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore, self._domain_slot(url):
+            self._count("downloads")
+            start = time.perf_counter()
+            try:
+                async with asyncio.timeout(self.url_timeout_seconds):
+                    response = await self._http_client().get(url, headers=headers)
+                    # httpx treats every non-2xx as an error, 304 included
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return response
+            finally:
+                self._count("download_seconds", time.perf_counter() - start)
+
+    async def _download_and_parse(self, url: str, parse: Callable, entry):
+        response = await self.download(url, headers=self.cache.validators(entry) if self.cache else None)
+        if response.status_code == 304:
+            if entry is None:
+                raise RuntimeError("304 Not Modified for an unconditional request")
+            await run_blocking_io(self.cache.mark_revalidated, url, entry)
+            return entry["article"]
+
+        start = time.perf_counter()
+        try:
+            article = await run_cpu_bound(parse, url, response.text)
+        finally:
+            self._count("parsed")
+            self._count("parse_seconds", time.perf_counter() - start)
+        if self.cache is not None:
+            await run_blocking_io(
+                self.cache.store_article, url, article, response.headers.get("ETag"), response.headers.get("Last-Modified")
+            )
+        return article
+
+    async def _shared(self, url: str, parse: Callable, entry):
+        """One download per URL however many requests want it; cancelled once nobody waits"""
+        shared = self._inflight.get(url)
+        if shared is None:
+            task = asyncio.create_task(self._download_and_parse(url, parse, entry))
+            shared = self._inflight[url] = [task, 0]
+            task.add_done_callback(lambda _: self._inflight.pop(url, None) if self._inflight.get(url) is shared else None)
+        else:
+            self._count("coalesced")
+        shared[1] += 1
+        try:
+            return await asyncio.shield(shared[0])
+        finally:
+            shared[1] -= 1
+            if shared[1] == 0 and not shared[0].done():
+                shared[0].cancel()
+
+    async def fetch(self, url: str, parse: Callable):
+        """Parsed article for one URL (cached or downloaded); None if it failed or has no article"""
+        # `parse(url, html)` runs in a worker process, so it must be a module-level function
+        self._count("fetches")
+        # News cache reads and writes are SQLite: they run on the blocking-io pool
+        entry = await run_blocking_io(self.cache.article, url) if self.cache else None
+        if self.cache is not None:
+            hit, article = self.cache.fresh_article(entry)
+            if hit:
+                return article
+        try:
+            return await self._shared(url, parse, entry)
+        except TimeoutError:
+            self._count("timeouts")
+            print(f"⏱️  Timed out fetching {url}")
+        except asyncio.CancelledError:
+            self._count("cancelled")
+            raise
+        except Exception as e:
+            self._count("failed")
+            print(f"❌ Error extracting from {url}: {e}")
+        return None
+
+    async def iter_first(self, urls: list[str], parse: Callable, limit: int, deadline: float | None = None):
+        """Yield the first `limit` articles parsed from `urls` as each completes; the rest are cancelled.
+
+        `deadline` is an event-loop time (loop.time()); iteration stops there.
+        """
+        tasks = [asyncio.create_task(self.fetch(url, parse)) for url in dict.fromkeys(urls)]
+        found = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                # The deadline only covers the wait, never the consumer's time at the yield
+                async with asyncio.timeout_at(deadline):
+                    article = await next_done
+                if article is None:
+                    continue
+                found += 1
+                self._count("succeeded")
+                yield article
+                if found >= limit:
+                    break
+        except TimeoutError:
+            self._count("deadline_hits")
+            print(f"⏱️  News fetch deadline reached with {found} article(s)")
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def fetch_first(self, urls: list[str], parse: Callable, limit: int, deadline: float | None = None) -> list:
+        """The first `limit` articles parsed from `urls`, in completion order (see iter_first)"""
+        return [article async for article in self.iter_first(urls, parse, limit, deadline)]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "per_domain": self.per_domain,
+                "active_domains": len(self._domains),
+                "fetches": self.fetches,
+                "coalesced": self.coalesced,
+                "downloads": self.downloads,
+                "parsed": self.parsed,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "timeouts": self.timeouts,
+                "cancelled": self.cancelled,
+                "deadline_hits": self.deadline_hits,
+                "mean_download_ms": round(self.download_seconds * 1000 / self.downloads, 1) if self.downloads else 0.0,
+                "mean_parse_ms": round(self.parse_seconds * 1000 / self.parsed, 1) if self.parsed else 0.0,
+            }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+article_fetcher = ArticleFetcher(
+    concurrency=config.NEWS_FETCH_CONCURRENCY,
+    per_domain=config.NEWS_FETCH_PER_DOMAIN,
+    url_timeout_seconds=config.NEWS_FETCH_TIMEOUT_SECONDS,
+    cache=news_cache if news_cache.enabled else None,
+)
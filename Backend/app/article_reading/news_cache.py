@@ -0,0 +1,136 @@
+"""
+Two-level on-disk cache for the news pipeline.
+
+    searches - normalized user query -> result URLs, short TTL (headlines move)
+    articles - URL -> parsed title/text/summary with the page's ETag and
+               Last-Modified; fresh for a longer TTL, after which the fetcher
+               revalidates with a conditional GET (a 304 reuses the entry).
+               Bounded by least recently used eviction. Summaries are
+               computed lazily and added to the entry once asked for.
+
+Pages without article text are cached as well (as None) so they are not
+downloaded again by every request that finds them.
+"""
+import threading
+import time
+
+from ..config import config
+from ..utils.sqlite_cache import SqliteCache
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class NewsCache:
+    def __init__(self, db_path: str, search_ttl_seconds: float, article_ttl_seconds: float, max_articles: int, enabled: bool = True):
+        self.enabled = enabled
+        self.search_ttl_seconds = search_ttl_seconds
+        self.article_ttl_seconds = article_ttl_seconds
+        self._searches = SqliteCache(db_path, table="news_searches") if enabled else None
+        self._articles = SqliteCache(db_path, table="news_articles", max_entries=max_articles) if enabled else None
+        self._lock = threading.Lock()
+        self.search_lookups = 0
+        self.search_hits = 0
+        self.article_lookups = 0
+        self.article_hits = 0
+        self.revalidated = 0
+
+    def _count(self, field: str, amount=1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + amount)
+
+    def search_urls(self, query: str):
+        """Cached result URLs for `query`, or None"""
+        if not self.enabled:
+            return None
+        self._count("search_lookups")
+        urls = self._searches.get(normalize_query(query))
+        if urls is not None:
+            self._count("search_hits")
+        return urls
+
+    def store_search(self, query: str, urls: list[str]):
+        if self.enabled and urls:
+            self._searches.set(normalize_query(query), urls, ttl_seconds=self.search_ttl_seconds)
+
+    def article(self, url: str):
+        """Cache entry for `url` (fresh or not), or None"""
+        if not self.enabled:
+            return None
+        return self._articles.get(url)
+
+    def has_article(self, url: str) -> bool:
+        """Whether `url` is a parsed article the news pipeline has returned to a client"""
+        entry = self.article(url)
+        return entry is not None and entry["article"] is not None
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry["validated_at"] < self.article_ttl_seconds
+
+    def fresh_article(self, entry):
+        """(hit, article) for an entry that needs no network round trip"""
+        self._count("article_lookups")
+        if entry is not None and self.is_fresh(entry):
+            self._count("article_hits")
+            return True, entry["article"]
+        return False, None
+
+    @staticmethod
+    def validators(entry) -> dict:
+        """Conditional request headers for revalidating a stale entry"""
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store_article(self, url: str, article, etag=None, last_modified=None):
+        if self.enabled:
+            self._articles.set(url, {
+                "article": article,
+                "etag": etag,
+                "last_modified": last_modified,
+                "validated_at": time.time(),
+            })
+
+    def store_summary(self, url: str, summary: str):
+        """Keep a lazily computed summary with the cached article"""
+        entry = self.article(url)
+        if entry is not None and entry["article"] is not None:
+            entry["article"]["summary"] = summary
+            self._articles.set(url, entry)
+
+    def mark_revalidated(self, url: str, entry: dict):
+        """The server answered 304: the cached article is fresh again"""
+        self._count("revalidated")
+        self.store_article(url, entry["article"], entry.get("etag"), entry.get("last_modified"))
+
+    def stats(self) -> dict:
+        if not self.enabled:
+            return {"enabled": False}
+        with self._lock:
+            return {
+                "enabled": True,
+                "searches": len(self._searches),
+                "articles": len(self._articles),
+                "search_lookups": self.search_lookups,
+                "search_hits": self.search_hits,
+                "search_hit_rate": round(self.search_hits / self.search_lookups, 3) if self.search_lookups else 0.0,
+                "article_lookups": self.article_lookups,
+                "article_hits": self.article_hits,
+                "article_hit_rate": round(self.article_hits / self.article_lookups, 3) if self.article_lookups else 0.0,
+                "revalidated": self.revalidated,
+                "evictions": self._articles.evictions,
+            }
+
+
+news_cache = NewsCache(
+    db_path=config.NEWS_CACHE_DB_PATH,
+    search_ttl_seconds=config.NEWS_SEARCH_CACHE_TTL_SECONDS,
+    article_ttl_seconds=config.NEWS_ARTICLE_CACHE_TTL_SECONDS,
+    max_articles=config.NEWS_ARTICLE_CACHE_MAX_ENTRIES,
+    enabled=config.NEWS_CACHE_ENABLED,
+)
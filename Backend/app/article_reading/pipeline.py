@@ -1,18 +1,23 @@
+import asyncio
 import os
 import re
 from dotenv import load_dotenv
 from newspaper import Article
 import requests
 import pyttsx3
-from langchain_community.chat_models import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
 import datetime
 import json
 
-# Download NLTK data on startup
+from ..config import config
+from ..utils.executors import run_blocking_io, run_cpu_bound
+from ..utils.llm_clients import llm_clients
+from .fetcher import article_fetcher
+from .news_cache import news_cache
+from .search import refine_search_query, search_news_urls, speculative_search
+from .article_parser import parse_html, summarize_text
+# NLTK data is downloaded once by the app's startup warm-up (or below when
+# run as a script); summarize_text() copes with it being missing
 from ..utils.nltk_init import download_nltk_data
-download_nltk_data()
 
 load_dotenv()
 
@@ -27,9 +32,9 @@ class ArticleExample:
 # ---- LLM SWITCHER ----
 def get_llm(provider: str):
     if provider == "openai":
-        return ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
+        return llm_clients.chat_model("openai", "gpt-4o-mini", temperature=0.7)
     elif provider == "groq":
-        return ChatGroq(model="llama3-8b-8192", groq_api_key=os.getenv("GROQ_API_KEY"))
+        return llm_clients.chat_model("groq", "llama3-8b-8192")
     else:
         raise ValueError("Unsupported provider")
 
@@ -56,50 +61,32 @@ Original query: "{original_query}"
 
 
 # ---- LLM-BASED SEARCH ----
-from ddgs import DDGS
+# Returned when the search itself fails (never cached)
+FALLBACK_NEWS_URLS = [
+    "https://www.bbc.com/news/technology",
+    "https://techcrunch.com/",
+    "https://www.theverge.com/",
+]
 
 def llm_search(query: str, llm, num_results=3):
     """
     1. Dùng LLM để tối ưu hóa từ khóa tìm kiếm (tùy chọn).
     2. Dùng DuckDuckGo để tìm link THẬT.
+    Sequential path; see search.speculative_search for the concurrent one.
     """
     print(f"\n🔍 Searching for: {query}")
 
     # Bước 1: (Tùy chọn) Dùng LLM để tạo từ khóa tìm kiếm tốt hơn
     # Ví dụ: User hỏi "AI mới nhất", LLM đổi thành "latest artificial intelligence news 2024"
-    search_query = query 
-    try:
-        refine_prompt = f"Convert this user question into a generic search engine keyword (e.g. Google) to find news articles. Return ONLY the keyword.\nQuestion: {query}"
-        response = llm.invoke(refine_prompt) # Bỏ comment nếu muốn dùng LLM
-        search_query = response.content.strip()
-    except:
-        pass
+    search_query = refine_search_query(query, llm)
 
     # Bước 2: Tìm kiếm thật bằng DuckDuckGo
-    real_urls = []
     try:
-        with DDGS() as ddgs:
-            # Tìm kiếm tin tức (news) hoặc web thông thường
-            results = ddgs.news(search_query, max_results=num_results + 2) # Lấy dư ra chút
-            
-            for r in results:
-                # r là dict: {'title': ..., 'url': ..., 'body': ..., 'date': ...}
-                link = r.get('url')
-                if link:
-                    real_urls.append(link)
-                    print(f"✅ Found: {link}")
-                
-                if len(real_urls) >= num_results:
-                    break
-                    
+        real_urls = search_news_urls(search_query, num_results)
     except Exception as e:
         print(f"❌ Search Error: {e}")
         # Fallback nếu lỗi mạng
-        return [
-            "https://www.bbc.com/news/technology",
-            "https://techcrunch.com/",
-            "https://www.theverge.com/"
-        ][:num_results]
+        return FALLBACK_NEWS_URLS[:num_results]
 
     if not real_urls:
          print("⚠️ No results found via search engine.")
@@ -109,31 +96,46 @@ def llm_search(query: str, llm, num_results=3):
 
 
 # ---- ARTICLE EXTRACTION ----
+def parse_article(url):
+    """Download and parse `url` with its summary; article fields or None if it has no text (blocking)"""
+    article = Article(url)
+    article.download()
+    return parse_html(url, article.html, summarize=True)
+
+
+def article_example(fields) -> ArticleExample:
+    return ArticleExample(fields["title"], fields["text"], fields["summary"], fields["url"])
+
+
+async def asummarize(fields) -> str:
+    """Summary for parsed article fields: the cached one, else computed in the process pool and cached"""
+    if fields.get("summary"):
+        return fields["summary"]
+    summary = await run_cpu_bound(
+        summarize_text, fields["title"], fields.get("body") or fields["text"], fields.get("language", "en")
+    )
+    fields["summary"] = summary
+    if summary:
+        await run_blocking_io(news_cache.store_summary, fields["url"], summary)
+    return summary
+
+
+async def aarticle_summary(url: str):
+    """Article fields with a summary for one URL (cached, or fetched now); None if it has no article"""
+    fields = await article_fetcher.fetch(url, parse_html)
+    if fields is not None:
+        await asummarize(fields)
+    return fields
+
+
 def extract_articles(urls):
+    """Sequential extraction for scripts; the API uses article_fetcher"""
     articles = []
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
-                      '(KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'
-    }
-
     for url in urls:
         try:
-            article = Article(url)
-            article.download()
-            article.parse()
-            
-            # Try to use NLP, but if NLTK data is missing, skip it
-            try:
-                article.nlp()
-            except LookupError as nltk_error:
-                print(f"⚠️ NLTK data missing, skipping NLP: {nltk_error}")
-                # Continue without NLP - we still have the parsed article
-            except Exception as nlp_error:
-                print(f"⚠️ NLP processing failed: {nlp_error}")
-                # Continue without NLP
-
-            if article.text.strip():
-                articles.append(ArticleExample(article.title, article.text[:2000], article.summary, url))
+            fields = parse_article(url)
+            if fields is not None:
+                articles.append(article_example(fields))
         except Exception as e:
             print(f"❌ Error extracting from {url}: {e}")
     return articles
@@ -191,7 +193,68 @@ def execute_pipeline(user_query: str, provider="openai"):  # Changed default fro
     return articles[:max_articles]
 
 
+async def asearch_urls(user_query: str, provider: str, deadline: float) -> list[str]:
+    """Candidate article URLs for the query: from the news cache, else searched before `deadline`"""
+    urls = await run_blocking_io(news_cache.search_urls, user_query)
+    if urls is None:
+        llm = get_llm(provider)
+        async with asyncio.timeout_at(deadline):
+            if config.NEWS_SPECULATIVE_SEARCH:
+                report = await speculative_search(user_query, llm, provider, config.NEWS_SEARCH_RESULTS)
+                urls = FALLBACK_NEWS_URLS[:config.NEWS_SEARCH_RESULTS] if report.failed else report.urls
+            else:
+                urls = await run_blocking_io(llm_search, user_query, llm, config.NEWS_SEARCH_RESULTS)
+        if urls and urls != FALLBACK_NEWS_URLS[:config.NEWS_SEARCH_RESULTS]:
+            await run_blocking_io(news_cache.store_search, user_query, urls)
+    print(f"🔗 Extracted URLs:\n{urls}\n")
+    return urls
+
+
+async def aexecute_pipeline(user_query: str, provider="openai", max_articles=None, include_summary=True):
+    """Search, then fetch candidate articles concurrently and keep the first that succeed.
+
+    The search and the fetches share one deadline (NEWS_PIPELINE_DEADLINE_SECONDS).
+    Search results and parsed articles come from the news cache when possible.
+    Summaries are only computed (or taken from the cache) for the articles
+    returned, and only with `include_summary`; otherwise summary is None.
+    """
+    max_articles = max_articles or config.NEWS_MAX_ARTICLES
+    deadline = asyncio.get_running_loop().time() + config.NEWS_PIPELINE_DEADLINE_SECONDS
+    print(f"🔍 Original Query:\n{user_query}\n")
+
+    urls = await asearch_urls(user_query, provider, deadline)
+    articles = await article_fetcher.fetch_first(urls, parse_html, max_articles, deadline)
+    print(f"📚 Retrieved {len(articles)} articles\n")
+
+    if include_summary and articles:
+        try:
+            async with asyncio.timeout_at(deadline):
+                await asyncio.gather(*(asummarize(fields) for fields in articles))
+        except TimeoutError:
+            print("⏱️  News pipeline deadline reached while summarizing")
+    return [article_example(fields) for fields in articles]
+
+
+async def astream_pipeline(user_query: str, provider="openai", max_articles=None, include_summary=True):
+    """aexecute_pipeline that yields each ArticleExample as soon as it is extracted (and summarized)"""
+    max_articles = max_articles or config.NEWS_MAX_ARTICLES
+    deadline = asyncio.get_running_loop().time() + config.NEWS_PIPELINE_DEADLINE_SECONDS
+    print(f"🔍 Original Query:\n{user_query}\n")
+
+    urls = await asearch_urls(user_query, provider, deadline)
+    # The remaining downloads keep running while an article is summarized and sent
+    async for fields in article_fetcher.iter_first(urls, parse_html, max_articles, deadline):
+        if include_summary:
+            try:
+                async with asyncio.timeout_at(deadline):
+                    await asummarize(fields)
+            except TimeoutError:
+                print("⏱️  News pipeline deadline reached while summarizing")
+        yield article_example(fields)
+
+
 # ---- MAIN ----
 if __name__ == "__main__":
+    download_nltk_data()
     query = input("Enter your query: ")
     execute_pipeline(query, provider="openai")  # Options: "openai", "gemini", "groq"
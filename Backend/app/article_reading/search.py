@@ -0,0 +1,188 @@
+"""
+News search for the article pipeline.
+
+The old path asked the LLM to rewrite the question into search keywords and
+only then searched DuckDuckGo: two round trips back to back before any
+article could be fetched. In speculative mode the raw question is searched
+straight away while the LLM refines it under a strict timeout; the refined
+keywords are searched as soon as they arrive and both result lists are
+merged, deduplicated by URL. A slow or failing LLM only costs its refined
+results, never the search. Each request logs the time saved against the
+sequential path and how much the two result lists overlapped.
+"""
+import asyncio
+import threading
+import time
+from typing import NamedTuple
+from urllib.parse import urlsplit, urlunsplit
+
+from ..config import config
+from ..utils.executors import run_blocking_io
+from ..utils.llm_clients import llm_clients
+
+REFINE_PROMPT = (
+    "Convert this user question into a generic search engine keyword (e.g. Google) "
+    "to find news articles. Return ONLY the keyword.\nQuestion: {query}"
+)
+
+
+def refine_search_query(query: str, llm) -> str:
+    """Search keywords for the question, or the question itself if the LLM fails (blocking)"""
+    try:
+        return llm.invoke(REFINE_PROMPT.format(query=query)).content.strip() or query
+    except Exception:
+        return query
+
+
+def search_news_urls(search_query: str, num_results: int) -> list[str]:
+    """Up to num_results article URLs from DuckDuckGo News (blocking; raises on search errors)"""
+    from ddgs import DDGS
+
+    urls = []
+    with DDGS() as ddgs:
+        # A few spare results in case some have no URL
+        for r in ddgs.news(search_query, max_results=num_results + 2):
+            link = r.get("url")
+            if link:
+                urls.append(link)
+                print(f"✅ Found: {link}")
+            if len(urls) >= num_results:
+                break
+    return urls
+
+
+def url_key(url: str) -> str:
+    """URL identity for deduplication: scheme, www., host case, fragment and trailing slash ignored"""
+    parts = urlsplit(url)
+    return urlunsplit(("", parts.netloc.lower().removeprefix("www."), parts.path.rstrip("/"), parts.query, ""))
+
+
+def merge_urls(*url_lists: list[str], limit: int) -> list[str]:
+    """Interleave the lists (best results of each first), dropping duplicate URLs"""
+    merged, seen = [], set()
+    for rank in range(max((len(urls) for urls in url_lists), default=0)):
+        for urls in url_lists:
+            if rank < len(urls) and url_key(urls[rank]) not in seen:
+                seen.add(url_key(urls[rank]))
+                merged.append(urls[rank])
+    return merged[:limit]
+
+
+def url_overlap(a: list[str], b: list[str]) -> float:
+    """Jaccard overlap of two result lists"""
+    keys_a, keys_b = {url_key(url) for url in a}, {url_key(url) for url in b}
+    if not keys_a or not keys_b:
+        return 0.0
+    return len(keys_a & keys_b) / len(keys_a | keys_b)
+
+
+class SearchReport(NamedTuple):
+    urls: list[str]
+    refined_query: str | None  # None if refinement failed or timed out
+    elapsed_ms: float
+    saved_ms: float            # Versus refining, then searching the refined query
+    overlap: float             # Raw vs refined results (Jaccard)
+    failed: bool               # Both searches failed
+
+
+class SearchStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.refine_timeouts = 0
+        self.refine_failures = 0
+        self.failures = 0
+        self.saved_ms = 0.0
+        self.overlap = 0.0
+        self.compared = 0
+
+    def record(self, report: SearchReport, refine_timed_out: bool):
+        with self._lock:
+            self.searches += 1
+            self.refine_timeouts += refine_timed_out
+            self.refine_failures += report.refined_query is None and not refine_timed_out
+            self.failures += report.failed
+            self.saved_ms += report.saved_ms
+            if report.refined_query is not None:
+                self.compared += 1
+                self.overlap += report.overlap
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "speculative": config.NEWS_SPECULATIVE_SEARCH,
+                "searches": self.searches,
+                "refine_timeouts": self.refine_timeouts,
+                "refine_failures": self.refine_failures,
+                "failures": self.failures,
+                "mean_saved_ms": round(self.saved_ms / self.searches, 1) if self.searches else 0.0,
+                "mean_overlap": round(self.overlap / self.compared, 3) if self.compared else 0.0,
+            }
+
+
+search_stats = SearchStats()
+
+
+async def _timed(coro):
+    """(result or exception, seconds)"""
+    start = time.perf_counter()
+    try:
+        result = await coro
+    except Exception as e:
+        result = e
+    return result, time.perf_counter() - start
+
+
+async def speculative_search(query: str, llm, provider: str, num_results: int) -> SearchReport:
+    """Search the raw query and the LLM-refined query concurrently and merge the results"""
+    start = time.perf_counter()
+    raw_search = asyncio.create_task(_timed(run_blocking_io(search_news_urls, query, num_results)))
+    refine = asyncio.create_task(_timed(llm_clients.call(
+        provider, llm.ainvoke, REFINE_PROMPT.format(query=query),
+        deadline_seconds=config.NEWS_REFINE_TIMEOUT_SECONDS,
+    )))
+
+    try:
+        response, refine_seconds = await refine
+        refined_query = None
+        if not isinstance(response, Exception):
+            refined_query = response.content.strip() or None
+        else:
+            print(f"⚠️  Query refinement skipped: {type(response).__name__}: {response}")
+
+        refined_urls, refined_search_seconds = [], 0.0
+        same_query = refined_query is not None and refined_query.lower() == query.lower()
+        if refined_query is not None and not same_query:
+            print(f"🎯 Refined Query: {refined_query}")
+            refined_urls, refined_search_seconds = await _timed(run_blocking_io(search_news_urls, refined_query, num_results))
+        raw_urls, raw_search_seconds = await raw_search
+        if same_query:
+            refined_urls, refined_search_seconds = raw_urls, raw_search_seconds
+    finally:
+        raw_search.cancel()
+        refine.cancel()
+
+    failed = isinstance(raw_urls, Exception) and (refined_query is None or isinstance(refined_urls, Exception))
+    if isinstance(raw_urls, Exception):
+        print(f"❌ Search Error: {raw_urls}")
+        raw_urls = []
+    if isinstance(refined_urls, Exception):
+        if not same_query:
+            print(f"❌ Search Error: {refined_urls}")
+        refined_urls = []
+
+    elapsed = time.perf_counter() - start
+    # The sequential path: refine, then search (the refined query when there is one)
+    sequential = refine_seconds + (refined_search_seconds if refined_query is not None else raw_search_seconds)
+    report = SearchReport(
+        urls=merge_urls(refined_urls, raw_urls, limit=num_results),
+        refined_query=refined_query,
+        elapsed_ms=round(elapsed * 1000, 1),
+        saved_ms=round(max(0.0, sequential - elapsed) * 1000, 1),
+        overlap=round(url_overlap(raw_urls, refined_urls), 3) if refined_query is not None else 0.0,
+        failed=failed,
+    )
+    search_stats.record(report, refine_timed_out=isinstance(response, TimeoutError))
+    print(f"⚡ Speculative search: {len(report.urls)} URLs in {report.elapsed_ms} ms "
+          f"(saved {report.saved_ms} ms, overlap {report.overlap})")
+    return report
@@ -18,8 +18,122 @@ class Config(object):
         self.DEEPGRAM_API_KEY = os.getenv('DEEPGRAM_API_KEY')
         self.GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
         # self.VOICE_RSS = os.getenv('Voice_RSS')
-        
-        # Validate critical API keys
+
+        # Shared model registry (see app/utils/model_manager.py); 0 = no budget
+        self.MODEL_MEMORY_BUDGET_MB = int(os.getenv('MODEL_MEMORY_BUDGET_MB', '0'))
+        self.MODEL_IDLE_SECONDS = float(os.getenv('MODEL_IDLE_SECONDS', '600'))
+        self.SENTENCE_EMBEDDER_MODEL = os.getenv('SENTENCE_EMBEDDER_MODEL', 'all-MiniLM-L6-v2')
+        # Intent-routing embedder backend: 'torch' or 'onnx' (int8, see export_onnx_embedder.py)
+        self.EMBEDDER_BACKEND = os.getenv('EMBEDDER_BACKEND', 'torch').lower()
+        self.EMBEDDER_ONNX_DIR = os.getenv('EMBEDDER_ONNX_DIR', str(Path(__file__).parent.parent.parent / "models" / "minilm-onnx-int8"))
+        self.EMBEDDER_ONNX_THREADS = int(os.getenv('EMBEDDER_ONNX_THREADS', '0'))
+
+        self.WHISPER_MODEL = os.getenv('WHISPER_MODEL', 'base.en')
+        # Models /whisper/reload may load (comma-separated); the configured model is always allowed
+        self.WHISPER_RELOAD_MODELS = {
+            name.strip() for name in os.getenv('WHISPER_RELOAD_MODELS', 'tiny.en,base.en').split(',') if name.strip()
+        } | {self.WHISPER_MODEL}
+        # Only count exact command keywords that appear as whole words/phrases
+        self.KEYWORD_MATCH_WORD_BOUNDARY = os.getenv('KEYWORD_MATCH_WORD_BOUNDARY', 'false').lower() in ('1', 'true', 'yes')
+
+        # Routing decisions cached per normalized transcript (0 disables the cache)
+        self.ROUTING_CACHE_SIZE = int(os.getenv('ROUTING_CACHE_SIZE', '1024'))
+        self.ROUTING_CACHE_TTL_SECONDS = float(os.getenv('ROUTING_CACHE_TTL_SECONDS', '0'))
+
+        # Short-utterance command transcription (see transcribe_command)
+        self.WHISPER_COMMAND_MAX_TOKENS = int(os.getenv('WHISPER_COMMAND_MAX_TOKENS', '32'))
+        self.WHISPER_COMMAND_VOCAB_BIAS = os.getenv('WHISPER_COMMAND_VOCAB_BIAS', 'true').lower() in ('1', 'true', 'yes')
+        # Vocabulary prompt length: every prompt token is prefilled on each command decode
+        self.WHISPER_COMMAND_PROMPT_MAX_TOKENS = int(os.getenv('WHISPER_COMMAND_PROMPT_MAX_TOKENS', '64'))
+        self.WHISPER_COMMAND_LANGUAGE = os.getenv('WHISPER_COMMAND_LANGUAGE', 'en')
+
+        # Largest accepted audio upload, decoded in memory (see app/utils/audio_io.py)
+        self.AUDIO_MAX_UPLOAD_BYTES = int(float(os.getenv('AUDIO_MAX_UPLOAD_MB', '10')) * 1024 * 1024)
+
+        # Dynamic micro-batching of concurrent command transcriptions
+        self.ASR_BATCHING = os.getenv('ASR_BATCHING', 'true').lower() in ('1', 'true', 'yes')
+        self.ASR_BATCH_MAX_SIZE = int(os.getenv('ASR_BATCH_MAX_SIZE', '8'))
+        self.ASR_BATCH_WINDOW_MS = float(os.getenv('ASR_BATCH_WINDOW_MS', '25'))
+
+        # WebSocket streaming transcription (/ws/transcribe_audio)
+        self.STREAM_END_SILENCE_MS = int(os.getenv('STREAM_END_SILENCE_MS', '600'))
+        self.STREAM_PARTIAL_INTERVAL_MS = int(os.getenv('STREAM_PARTIAL_INTERVAL_MS', '800'))
+        self.STREAM_MAX_UTTERANCE_MS = int(os.getenv('STREAM_MAX_UTTERANCE_MS', '15000'))
+
+        # Worker pool sizes per workload class (see app/utils/executors.py)
+        self.INFERENCE_WORKERS = int(os.getenv('INFERENCE_WORKERS', '2'))
+        self.BLOCKING_IO_WORKERS = int(os.getenv('BLOCKING_IO_WORKERS', '16'))
+        # Processes for pure-Python CPU work such as article parsing/NLP (0 = use blocking-io threads)
+        self.CPU_PROCESS_WORKERS = int(os.getenv('CPU_PROCESS_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+        # Shared LLM HTTP connection pools (see app/utils/llm_clients.py)
+        self.LLM_MAX_CONNECTIONS = int(os.getenv('LLM_MAX_CONNECTIONS', '50'))
+        self.LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('LLM_MAX_KEEPALIVE_CONNECTIONS', '20'))
+        self.LLM_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv('LLM_KEEPALIVE_EXPIRY_SECONDS', '60'))
+        self.LLM_TIMEOUT_SECONDS = float(os.getenv('LLM_TIMEOUT_SECONDS', '60'))
+        self.LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv('LLM_CONNECT_TIMEOUT_SECONDS', '5'))
+        self.LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '2'))
+
+        # Async LLM calls: max in flight per provider, and a per-request deadline (0 = none)
+        self.LLM_CONCURRENCY = {
+            'openai': int(os.getenv('LLM_CONCURRENCY_OPENAI', '16')),
+            'groq': int(os.getenv('LLM_CONCURRENCY_GROQ', '8')),
+        }
+        self.LLM_REQUEST_DEADLINE_SECONDS = float(os.getenv('LLM_REQUEST_DEADLINE_SECONDS', '45'))
+
+        # Semantic cache of general QA answers (see app/utils/semantic_cache.py);
+        # QA_CACHE_DB_PATH adds an on-disk SQLite copy that survives restarts
+        self.QA_CACHE_ENABLED = os.getenv('QA_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+        self.QA_CACHE_THRESHOLD = float(os.getenv('QA_CACHE_THRESHOLD', '0.93'))
+        self.QA_CACHE_SIZE = int(os.getenv('QA_CACHE_SIZE', '512'))
+        self.QA_CACHE_TTL_SECONDS = float(os.getenv('QA_CACHE_TTL_SECONDS', '3600'))
+        self.QA_CACHE_DB_PATH = os.getenv('QA_CACHE_DB_PATH', '')
+
+        # Vision answers reused for near-identical camera frames (dHash Hamming distance, of 64 bits)
+        self.FRAME_CACHE_ENABLED = os.getenv('FRAME_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+        self.FRAME_CACHE_MAX_DISTANCE = int(os.getenv('FRAME_CACHE_MAX_DISTANCE', '6'))
+        self.FRAME_CACHE_SIZE = int(os.getenv('FRAME_CACHE_SIZE', '256'))
+        self.FRAME_CACHE_TTL_SECONDS = float(os.getenv('FRAME_CACHE_TTL_SECONDS', '30'))
+        # Text reading needs a near-exact frame: a small shift already shows different lines
+        self.FRAME_CACHE_TEXT_MAX_DISTANCE = int(os.getenv('FRAME_CACHE_TEXT_MAX_DISTANCE', '1'))
+        # Product descriptions are reused per decoded barcode rather than per frame
+        self.PRODUCT_ANSWER_CACHE_TTL_SECONDS = float(os.getenv('PRODUCT_ANSWER_CACHE_TTL_SECONDS', '3600'))
+
+        # Downscale/re-encode images per task before vision-LLM calls (see app/utils/image_prep.py);
+        # IMAGE_PREP_FORMAT forces JPEG or WEBP for every task
+        self.IMAGE_PREP_ENABLED = os.getenv('IMAGE_PREP_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+        self.IMAGE_PREP_FORMAT = os.getenv('IMAGE_PREP_FORMAT', '').upper()
+
+        # Product/ISBN lookups cached in SQLite, including "not found" answers
+        self.PRODUCT_CACHE_DB_PATH = os.getenv('PRODUCT_CACHE_DB_PATH', str(Path(__file__).parent.parent.parent / "cache" / "products.sqlite"))
+        self.PRODUCT_CACHE_TTL_SECONDS = float(os.getenv('PRODUCT_CACHE_TTL_SECONDS', str(30 * 24 * 3600)))
+        self.PRODUCT_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv('PRODUCT_CACHE_NEGATIVE_TTL_SECONDS', str(24 * 3600)))
+        self.PRODUCT_LOOKUP_TIMEOUT_SECONDS = float(os.getenv('PRODUCT_LOOKUP_TIMEOUT_SECONDS', '5'))
+        # Describe sample_product.json when a barcode is unknown (demo behaviour)
+        self.PRODUCT_SAMPLE_FALLBACK = os.getenv('PRODUCT_SAMPLE_FALLBACK', 'true').lower() in ('1', 'true', 'yes')
+
+        # News pipeline: concurrent article downloads (see app/article_reading/fetcher.py)
+        self.NEWS_SEARCH_RESULTS = int(os.getenv('NEWS_SEARCH_RESULTS', '6'))
+        self.NEWS_MAX_ARTICLES = int(os.getenv('NEWS_MAX_ARTICLES', '3'))
+        self.NEWS_FETCH_CONCURRENCY = int(os.getenv('NEWS_FETCH_CONCURRENCY', '8'))
+        self.NEWS_FETCH_PER_DOMAIN = int(os.getenv('NEWS_FETCH_PER_DOMAIN', '2'))
+        self.NEWS_FETCH_TIMEOUT_SECONDS = float(os.getenv('NEWS_FETCH_TIMEOUT_SECONDS', '8'))
+        self.NEWS_PIPELINE_DEADLINE_SECONDS = float(os.getenv('NEWS_PIPELINE_DEADLINE_SECONDS', '20'))
+        # Search the raw and the LLM-refined news query concurrently (see app/article_reading/search.py)
+        self.NEWS_SPECULATIVE_SEARCH = os.getenv('NEWS_SPECULATIVE_SEARCH', 'true').lower() in ('1', 'true', 'yes')
+        self.NEWS_REFINE_TIMEOUT_SECONDS = float(os.getenv('NEWS_REFINE_TIMEOUT_SECONDS', '2.5'))
+        # On-disk news cache: query -> URLs, URL -> parsed article (see app/article_reading/news_cache.py)
+        self.NEWS_CACHE_ENABLED = os.getenv('NEWS_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+        self.NEWS_CACHE_DB_PATH = os.getenv('NEWS_CACHE_DB_PATH', str(Path(__file__).parent.parent.parent / "cache" / "news.sqlite"))
+        self.NEWS_SEARCH_CACHE_TTL_SECONDS = float(os.getenv('NEWS_SEARCH_CACHE_TTL_SECONDS', '600'))
+        self.NEWS_ARTICLE_CACHE_TTL_SECONDS = float(os.getenv('NEWS_ARTICLE_CACHE_TTL_SECONDS', str(6 * 3600)))
+        self.NEWS_ARTICLE_CACHE_MAX_ENTRIES = int(os.getenv('NEWS_ARTICLE_CACHE_MAX_ENTRIES', '2000'))
+
+        # Import heavy modules and load models in the background after startup
+        self.WARM_UP_ON_STARTUP = os.getenv('WARM_UP_ON_STARTUP', 'true').lower() in ('1', 'true', 'yes')
+
+    def validate(self):
+        # Validate critical API keys (run during startup warm-up, not at import)
         if not self.GOOGLE_API_KEY:
             raise ValueError("GOOGLE_API_KEY environment variable is not set. Please check your .env file.")
 
@@ -1,96 +1,55 @@
-import base64
-import cv2
-from fastapi import FastAPI, Form, Request
-from fastapi.responses import JSONResponse, RedirectResponse, FileResponse
-from fastapi.middleware.cors import CORSMiddleware
-from fpdf import FPDF
-import numpy as np
-import openai
-from pydantic import BaseModel, Json
-from sympy import content
-
 import time
 
-# Preload Whisper model for better performance
-whisper_model = None
-whisper_model_timestamp = 0
-whisper_model_loading = False  # Flag to prevent concurrent loading
-WHISPER_MODEL_CACHE_DURATION = 3600  # Cache for 1 hour
-
-def load_whisper_model():
-    global whisper_model, whisper_model_timestamp, whisper_model_loading
-    
-    # Prevent concurrent loading
-    if whisper_model_loading:
-        print("⏳ Whisper model is already loading, waiting...")
-        # Wait until loading is complete (simple approach)
-        while whisper_model_loading:
-            time.sleep(0.1)
-        return whisper_model
-    
-    # Check if model needs to be refreshed (cache invalidation)
-    current_time = time.time()
-    if whisper_model is not None and (current_time - whisper_model_timestamp) < WHISPER_MODEL_CACHE_DURATION:
-        print("⚡ Using cached Whisper model")
-        return whisper_model
-    
-    # Load or reload the model
-    try:
-        whisper_model_loading = True
-        import whisper
-        print("🔄 Loading Whisper model...")
-        whisper_model = whisper.load_model("base.en")
-        whisper_model_timestamp = time.time()
-        print("✅ Whisper model loaded successfully")
-    except Exception as e:
-        print(f"⚠️  Failed to load Whisper model: {e}")
-        whisper_model = None
-    finally:
-        whisper_model_loading = False
-    return whisper_model
+from app.utils.startup import startup_report
 
-# Load model on startup
-load_whisper_model()
+_import_started = time.perf_counter()
 
-from app.article_reading.pipeline import execute_pipeline
-from app.question_answering.pipeline import ask_general_question
-from app.utils.audio import FEATURE_KEYWORDS_FOR_SEMANTIC_MATCH, FEATURE_LABELS, FEATURE_NAMES, find_navigation_intent, route_query_semantically
-from app.utils.deepgram import transcribe_audio
-from .utils.formatter import create_pdf, create_pdf_async, format_article_audio_response, format_audio_response
+import base64
+from fastapi import FastAPI, Form, Request
+from fastapi.responses import JSONResponse, FileResponse
+from fastapi.middleware.cors import CORSMiddleware
+import numpy as np
+from pydantic import BaseModel
+
+# Heavy dependencies (torch, Whisper, sentence-transformers, langchain,
+# newspaper, OpenCV, gTTS...) are imported lazily by the endpoints that need
+# them or by the background warm-up below, never at module import.
+from app.utils.deepgram import swap_whisper_model, whisper_model
+from app.utils.audio import FEATURE_KEYWORDS_FOR_SEMANTIC_MATCH, FEATURE_LABELS, FEATURE_NAMES, find_navigation_intent, get_intent_index, label_keyword_matcher, normalize_transcript, route_query_semantically, routing_cache, routing_tables_version
+from app.utils.asr_batcher import asr_batcher
+from app.utils.audio_io import UploadSizeLimit, check_ffmpeg, decode_upload
+from app.utils.vad import SAMPLE_RATE, StreamingEndpointer
+from app.utils.embedders import SENTENCE_EMBEDDER, embedder
+from app.utils.model_manager import model_registry
+from app.utils.executors import executor_stats, run_blocking_io, run_inference, shutdown_executors
+from app.utils.llm_clients import llm_clients
+from app.utils.semantic_cache import qa_response_cache
+from app.utils.frame import Frame
+from app.all_task.product_recognition import product_answer_cache, product_lookup
+from app.article_reading.fetcher import article_fetcher, is_public_http_url
+from app.article_reading.news_cache import news_cache
+from app.article_reading.search import search_stats
+from app.utils.frame_cache import vision_frame_cache
+from app.utils.image_prep import image_prep_stats
+from app.utils.sse import llm_sse_events, sse_response
+from app.utils.ndjson import ndjson_line, ndjson_response
 from .config import config
-from .text_recognition.provider.ocr.ocr import OcrRecognition
-import sys
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import FileResponse
-from tempfile import NamedTemporaryFile
-from deepface import DeepFace
-import time
+from fastapi import File, UploadFile, HTTPException, WebSocket, WebSocketDisconnect
 import asyncio
 import json
-import mimetypes
-from fastapi import FastAPI, UploadFile, File
-from sentence_transformers import SentenceTransformer, util
 from dotenv import load_dotenv
 from pathlib import Path
 import os
 import tempfile
 import requests
-from collections import OrderedDict
-from .all_task.pipeline import get_llm_response
 import urllib.parse
 
-# Initialize the sentence transformer model
-embedder = SentenceTransformer('all-MiniLM-L6-v2')
-
 # Load .env from the project root
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
-# Initialize NLTK data for article processing
-from .utils.nltk_init import download_nltk_data
-download_nltk_data()
+startup_report.record("import app.main", time.perf_counter() - _import_started)
 
-start = time.time()
 # ocr = OcrRecognition()
 # currency_detection_model_path = "./models/best8.onnx"
 # currency_detector = YOLOv8(currency_detection_model_path, conf_thres=0.2, iou_thres=0.3)
@@ -100,6 +59,10 @@ start = time.time()
 
 app = FastAPI()
 
+# Refuse oversized audio uploads before their body is received (inside CORS,
+# so browsers can read the 413)
+app.add_middleware(UploadSizeLimit, paths={"/transcribe_audio"})
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -111,42 +74,123 @@ app.add_middleware(
 
 # Define allowed origins (frontend URLs)
 
+def warm_up():
+    """Import heavy modules and load models once, recording the cost of each step"""
+    startup_report.step("config", config.validate)
+    startup_report.step("ffmpeg", check_ffmpeg, required=True)
+    for module in ("torch", "whisper", "sentence_transformers", "app.all_task.pipeline", "app.article_reading.pipeline"):
+        startup_report.import_module(module)
+
+    from .utils.nltk_init import download_nltk_data
+    startup_report.step("nltk data", download_nltk_data)
+    startup_report.step("load whisper", whisper_model.get, required=True)
+    startup_report.step("load sentence embedder", model_registry.get, SENTENCE_EMBEDDER, required=True)
+    startup_report.step("build intent index", get_intent_index, embedder, FEATURE_LABELS, required=True)
+
+    from .all_task.pipeline import get_llm
+    startup_report.step("llm client", get_llm, "openai")
+
+
+async def evict_idle_models():
+    """Periodically unload idle evictable models while over MODEL_MEMORY_BUDGET_MB"""
+    while True:
+        await asyncio.sleep(max(1.0, config.MODEL_IDLE_SECONDS / 2))
+        model_registry.enforce_budget()
+
+
+@app.on_event("startup")
+async def start_warm_up():
+    # Serve /health straight away; models load in the background
+    if config.WARM_UP_ON_STARTUP:
+        startup_report.track(asyncio.create_task(run_blocking_io(warm_up)))
+    else:
+        startup_report.mark_ready()
+    if config.MODEL_MEMORY_BUDGET_MB:
+        app.state.model_eviction = asyncio.create_task(evict_idle_models())
+
+
+@app.on_event("shutdown")
+async def shutdown_worker_pools():
+    asr_batcher.close()
+    await llm_clients.aclose()
+    await product_lookup.aclose()
+    await article_fetcher.aclose()
+    shutdown_executors()
+
+
+def save_temp_file(data: bytes, suffix: str = "") -> str:
+    """Write bytes to a named temp file and return its path (blocking)"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        tmp.write(data)
+        return tmp.name
+
 @app.get("/")
 async def read_root():
     return {"Hello": "World"}
 
 @app.get("/health")
 async def health_check():
-    global whisper_model, whisper_model_timestamp
-    
-    # Check Whisper model status
-    model_status = "loaded" if whisper_model is not None else "not loaded"
-    
-    # Calculate model age if loaded
-    model_age = 0
-    if whisper_model is not None:
-        import time
-        model_age = time.time() - whisper_model_timestamp
-    
     return {
         "status": "healthy",
-        "whisper_model": {
-            "status": model_status,
-            "age_seconds": model_age
-        }
+        "ready": startup_report.ready,
+        "startup": startup_report.snapshot(),
+        "whisper_model": whisper_model.stats(),
+        "models": model_registry.stats(),
+        "executors": executor_stats(),
+        "asr_batcher": asr_batcher.stats(),
+        "routing_cache": routing_cache.stats(),
+        "llm_clients": llm_clients.stats(),
+        "qa_cache": qa_response_cache.stats(),
+        "frame_cache": vision_frame_cache.stats(),
+        "image_prep": image_prep_stats.snapshot(),
+        "product_lookup": product_lookup.stats(),
+        "product_answers": product_answer_cache.stats(),
+        "article_fetcher": article_fetcher.stats(),
+        "news_cache": await run_blocking_io(news_cache.stats),
+        "news_search": search_stats.snapshot(),
     }
 
+@app.get("/ready")
+async def readiness_check():
+    """503 until the background warm-up has finished with every required step ok (for readiness probes)"""
+    if not startup_report.ready:
+        return JSONResponse(
+            content={
+                "ready": False,
+                "failed_steps": startup_report.failed_steps(),
+                "startup": startup_report.snapshot(),
+            },
+            status_code=503,
+        )
+    return {"ready": True}
+
+@app.post("/whisper/reload")
+async def reload_whisper_model(model_name: str | None = Form(None)):
+    """Load new Whisper weights on the side and swap them in (only models in WHISPER_RELOAD_MODELS)"""
+    if model_name and model_name not in config.WHISPER_RELOAD_MODELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Model not allowed; choose one of: {', '.join(sorted(config.WHISPER_RELOAD_MODELS))}",
+        )
+    try:
+        stats = await run_blocking_io(swap_whisper_model, model_name)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to reload Whisper model: {str(e)}")
+    return {"status": "reloaded", "whisper_model": stats}
+
 @app.post("/document_recognition")
 async def document_recognition(file: UploadFile = File(...)):
     try:
+        from .all_task.pipeline import aget_llm_response
+
         start = time.time()
-        image_data = await file.read()
-        base64_image = base64.b64encode(image_data).decode("utf-8")
+        # Decoded/encoded lazily, at most once, by whichever stages need it
+        frame = Frame.from_bytes(await file.read())
 
-        result = get_llm_response(
+        result = await aget_llm_response(
             query="Extract text from this image.",
             task="text_recognition",
-            base64_image=base64_image,
+            base64_image=frame,
         )
 
         if not result:
@@ -157,6 +201,8 @@ async def document_recognition(file: UploadFile = File(...)):
             "text": result,
         })
 
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="The text recognition request timed out")
     except Exception as e:
         print(f"Lỗi xảy ra: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -168,11 +214,11 @@ image_path = "./app/dis.jpg"
 @app.post("music_detection")
 async def music_detection(file: UploadFile = File(...)):
     try:
-        with NamedTemporaryFile(delete=False) as temp:
-            temp.write(file.file.read())
-            temp_path = temp.name
+        from .utils.formatter import format_audio_response
+
+        temp_path = await run_blocking_io(save_temp_file, await file.read())
 
-        audio_path = format_audio_response(temp_path, "music_recognition")
+        audio_path = await run_blocking_io(format_audio_response, temp_path, "music_recognition")
         if audio_path:
             return JSONResponse(content={
                 "audio_path": audio_path,
@@ -200,12 +246,10 @@ async def process_voice_command(file: UploadFile = File(...), current_feature: s
         A dictionary containing the transcription, recognized intent ('navigate' or 'query'),
         target feature, confidence score, and original query text if applicable.
     """
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as tmp:
-        tmp.write(await file.read())
-        tmp_path = tmp.name
+    audio = await decode_upload(file)
 
     try:
-        transcript_result = transcribe_audio(tmp_path)
+        transcript_result = await asr_batcher.transcribe(audio)
 
         if not transcript_result or "transcript" not in transcript_result:
              raise HTTPException(status_code=500, detail="Transcription failed.")
@@ -263,7 +307,8 @@ async def process_voice_command(file: UploadFile = File(...), current_feature: s
 
         # Option B: Context unknown or it's a query needing routing
         # Use semantic similarity to find the best feature *for the query*
-        semantic_routing_result = route_query_semantically(
+        semantic_routing_result = await run_inference(
+            route_query_semantically,
             transcript_text,
             embedder,
             FEATURE_KEYWORDS_FOR_SEMANTIC_MATCH # Use the detailed keywords here
@@ -283,80 +328,196 @@ async def process_voice_command(file: UploadFile = File(...), current_feature: s
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Failed to process audio: {str(e)}")
-    finally:
-        # Clean up the temporary file
-        import os
-        if 'tmp_path' in locals() and os.path.exists(tmp_path):
-             os.unlink(tmp_path)
 
 from typing import Annotated
 
 
+async def route_voice_command(transcript_text: str, current_feature: str | None) -> dict:
+    """Serve repeated commands from the routing cache; only misses reach the inference pool"""
+    # The normalized transcript only keys the cache; routing sees what the user said
+    key = ("voice", normalize_transcript(transcript_text), current_feature, routing_tables_version())
+    routing = routing_cache.get(key)
+    if routing is None:
+        routing = await run_inference(decide_voice_command, transcript_text, current_feature)
+        routing_cache.put(key, routing)
+    return {**routing, "query": transcript_text}
+
+
+def decide_voice_command(transcript_text: str, current_feature: str | None) -> dict:
+    """Map a lower-cased transcript to a command: exact keyword match first, then semantic fallback"""
+    # Step 1: Exact keyword match (single automaton pass; first label/keyword in table order wins)
+    match = label_keyword_matcher.first(transcript_text)
+    if match:
+        label = match.payload
+        if label == current_feature:
+            if "read" not in transcript_text.lower():
+                return {
+                    "command": current_feature,
+                    "intent": "query",
+                    "confidence": 0.9,  # high confidence
+                    "query": transcript_text
+                }
+            else:
+                return {
+                    "command": current_feature,
+                    "intent": "read",
+                    "confidence": 0.9,  # high confidence
+                    "query": transcript_text
+                }
+
+        return {
+            "command": label,
+            "intent": "navigate",
+            "confidence": 1.0,  # exact match = high confidence
+            "query": transcript_text
+        }
+
+    # Step 2: Semantic similarity fallback (best single phrase per label)
+    label_index = get_intent_index(embedder, FEATURE_LABELS)  # Built once, normally during warm-up
+    best_match, best_score = label_index.best_match(transcript_text, reduction="max")
+
+    return {
+        "command": best_match,
+        "intent": "navigate",
+        "confidence": round(best_score, 3),
+        "query": transcript_text
+    }
+
+
 @app.post("/transcribe_audio")
 async def voice_command(
     file: Annotated[UploadFile, File()],
     current_feature: Annotated[str, Form()]
     ):
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as tmp:
-        tmp.write(await file.read())
-        tmp_path = tmp.name
+    audio = await decode_upload(file)
 
     try:
-        transcript_result = transcribe_audio(tmp_path)
+        transcript_result = await asr_batcher.transcribe(audio)
         transcript_text = transcript_result.get("transcript", "").lower()
 
         print("Transcript:", transcript_text)
         print("Current Feature:", current_feature)
 
-        # Step 1: Exact keyword match
-        for label, keywords in FEATURE_LABELS.items():
-            for keyword in keywords:
-                if keyword.lower() in transcript_text:
-                    if label == current_feature:
-                        if "read" not in transcript_text.lower():
-                            return {
-                                "command": current_feature,
-                                "intent": "query",
-                                "confidence": 0.9,  # high confidence
-                                "query": transcript_text
-                            }
-                        else:
-                            return {
-                                "command": current_feature,
-                                "intent": "read",
-                                "confidence": 0.9,  # high confidence
-                                "query": transcript_text
-                            }
-                        
-                    return {
-                        "command": label,
-                        "intent": "navigate",
-                        "confidence": 1.0,  # exact match = high confidence
-                        "query": transcript_text
-                    }
-
-        # Step 2: Semantic similarity fallback
-        transcript_embed = embedder.encode(transcript_text, convert_to_tensor=True)
-        best_match, best_score = None, -1
-
-        for label, phrases in FEATURE_LABELS.items():
-            for phrase in phrases:
-                phrase_embed = embedder.encode(phrase, convert_to_tensor=True)
-                score = util.cos_sim(transcript_embed, phrase_embed).item()
-                if score > best_score:
-                    best_match, best_score = label, score
-
-        return {
-            "command": best_match,
-            "intent": "navigate",
-            "confidence": round(best_score, 3),
-            "query": transcript_text
-        }
+        return await route_voice_command(transcript_text, current_feature)
     except Exception as e:
         print("❌ Error:", e)
         return {"error": "Failed to process audio."}
 
 
+PCM_DTYPES = {"pcm_s16le": np.int16, "pcm_f32le": np.float32}
+
+
+@app.websocket("/ws/transcribe_audio")
+async def stream_voice_command(websocket: WebSocket):
+    """
+    Streaming counterpart of /transcribe_audio.
+
+    The client sends binary frames of mono 16 kHz PCM audio while recording,
+    and JSON text messages to control the session:
+        {"current_feature": "News", "encoding": "pcm_s16le" | "pcm_f32le"}
+        {"event": "end"}  - force the end of the current utterance
+
+    The server segments speech as it arrives and replies with JSON events:
+        {"type": "speech_start"}
+        {"type": "partial", "transcript": ...}  - while the user is speaking
+        {"type": "final", "transcript": ..., "command": ..., "intent": ..., ...}
+    Routing runs as soon as the end of speech is detected; the connection then
+    stays open for the next utterance.
+    """
+    await websocket.accept()
+    endpointer = StreamingEndpointer(
+        end_silence_ms=config.STREAM_END_SILENCE_MS,
+        max_utterance_ms=config.STREAM_MAX_UTTERANCE_MS,
+    )
+    session = {"current_feature": None, "dtype": np.int16}
+    send_lock = asyncio.Lock()
+    partial_task = None
+    last_partial_at = 0.0
+
+    async def send(message: dict):
+        async with send_lock:
+            await websocket.send_json(message)
+
+    async def send_partial(audio):
+        result = await asr_batcher.transcribe(audio)
+        if result.get("transcript") and endpointer.in_speech:
+            await send({"type": "partial", "transcript": result["transcript"]})
+
+    async def finalize(audio):
+        nonlocal partial_task
+        if partial_task is not None:
+            partial_task.cancel()
+            partial_task = None
+        result = await asr_batcher.transcribe(audio)
+        transcript_text = result.get("transcript", "").lower()
+        if not transcript_text:
+            await send({"type": "final", "transcript": "", "error": result.get("error", "No transcript detected.")})
+            return
+        routing = await route_voice_command(transcript_text, session["current_feature"])
+        await send({"type": "final", "transcript": transcript_text, **routing})
+
+    try:
+        await send({"type": "ready", "sample_rate": SAMPLE_RATE})
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("text") is not None:
+                control = json.loads(message["text"])
+                if "current_feature" in control:
+                    session["current_feature"] = control["current_feature"]
+                if control.get("encoding") in PCM_DTYPES:
+                    session["dtype"] = PCM_DTYPES[control["encoding"]]
+                if control.get("event") == "end":
+                    audio = endpointer.flush()
+                    if audio is not None:
+                        await finalize(audio)
+                continue
+
+            # A frame with a partial sample is dropped on its own; the stream goes on
+            frame = message.get("bytes") or b""
+            sample_size = np.dtype(session["dtype"]).itemsize
+            if len(frame) % sample_size:
+                await send({
+                    "type": "error",
+                    "detail": f"Audio frame of {len(frame)} bytes is not a whole number of {sample_size}-byte samples; frame dropped.",
+                })
+                continue
+            samples = np.frombuffer(frame, dtype=session["dtype"])
+            if session["dtype"] == np.int16:
+                samples = samples.astype(np.float32) / 32768.0
+
+            for event, audio in endpointer.feed(samples):
+                if event == "start":
+                    last_partial_at = 0.0
+                    await send({"type": "speech_start"})
+                else:
+                    await finalize(audio)
+
+            # Emit a partial transcript every STREAM_PARTIAL_INTERVAL_MS of speech
+            speech_ms = endpointer.speech_seconds * 1000
+            if (
+                endpointer.in_speech
+                and speech_ms - last_partial_at >= config.STREAM_PARTIAL_INTERVAL_MS
+                and (partial_task is None or partial_task.done())
+            ):
+                last_partial_at = speech_ms
+                partial_task = asyncio.create_task(send_partial(endpointer.speech_audio()))
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print("❌ Streaming error:", e)
+        try:
+            await send({"type": "error", "detail": "Failed to process audio stream."})
+        except Exception:
+            pass
+    finally:
+        if partial_task is not None:
+            partial_task.cancel()
+
+
 class NewsQuery(BaseModel):
     news_query: str
 
@@ -364,7 +525,7 @@ class ChatbotQuery(BaseModel):
     message: str
 
 @app.post("/fetching_news")
-async def article_reading(news_query: str = Form(...)):
+async def article_reading(news_query: str = Form(...), include_summary: bool = Form(True)):
 
     try:
         if not news_query:
@@ -374,7 +535,9 @@ async def article_reading(news_query: str = Form(...)):
         if "error" in news_query:
             raise HTTPException(status_code=400, detail="Failed to transcribe audio")
         
-        articles = execute_pipeline(news_query)
+        from .article_reading.pipeline import aexecute_pipeline
+
+        articles = await aexecute_pipeline(news_query, include_summary=include_summary)
 
         if not articles:
             raise HTTPException(status_code=400, detail="No valid articles found")
@@ -399,14 +562,76 @@ async def article_reading(news_query: str = Form(...)):
         print(e)
         return {"error": "Failed to process audio."}
 
+@app.post("/fetching_news/stream")
+async def article_reading_stream(news_query: str = Form(...), include_summary: bool = Form(True)):
+    """Stream articles as NDJSON, one line each as soon as it is extracted.
+
+    {"type": "article", "index": n, "title", "text", "summary", "url"} per
+    article, then {"type": "status", "status": "ok" | "empty" | "error",
+    "count": n, "elapsed_ms": ...}.
+    """
+    if not news_query:
+        raise HTTPException(status_code=400, detail="No news query provided")
+    if "error" in news_query:
+        raise HTTPException(status_code=400, detail="Failed to transcribe audio")
+
+    from .article_reading.pipeline import astream_pipeline
+
+    async def records():
+        start = time.perf_counter()
+        count = 0
+        status = {"status": "ok"}
+        try:
+            async for article in astream_pipeline(news_query, include_summary=include_summary):
+                yield ndjson_line({
+                    "type": "article",
+                    "index": count,
+                    "title": article.title,
+                    "text": article.text,
+                    "summary": article.summary,
+                    "url": article.url,
+                })
+                count += 1
+            if not count:
+                status = {"status": "empty", "detail": "No valid articles found"}
+        except Exception as e:
+            print(f"❌ News stream failed: {e}")
+            status = {"status": "error", "detail": "Failed to fetch news"}
+        yield ndjson_line({
+            "type": "status",
+            **status,
+            "count": count,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        })
+
+    return ndjson_response(records())
+
+@app.post("/article_summary")
+async def article_summary(url: str = Form(...)):
+    """Summary of one article, e.g. one fetched with include_summary=false (cached per URL).
+
+    Only articles /fetching_news returned (and the news cache still holds) are
+    served, so the endpoint never fetches arbitrary client-supplied URLs.
+    """
+    from .article_reading.pipeline import aarticle_summary
+
+    known = await run_blocking_io(news_cache.has_article, url)
+    if not known or not await run_blocking_io(is_public_http_url, url):
+        raise HTTPException(status_code=404, detail="Unknown article; request it through /fetching_news first")
+    fields = await aarticle_summary(url)
+    if fields is None:
+        raise HTTPException(status_code=404, detail="No article found at this URL")
+    return {"url": url, "title": fields["title"], "summary": fields["summary"]}
+
 @app.post("/general_question_answering")
 async def general_qa(message: str = Form(...)):
 
     try:
         print(f"[DEBUG] Received message: {message}", flush=True)
+        from .all_task.pipeline import aget_llm_response
 
         # Step 3: Ask the LLM to answer the question
-        answer = get_llm_response(
+        answer = await aget_llm_response(
             query=message,
             task="general_question_answering",
             base64_image=None
@@ -431,6 +656,8 @@ async def general_qa(message: str = Form(...)):
                 "reply": answer,
             }, status_code=200)
 
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="The question answering request timed out")
     except Exception as e:
         print(f"[ERROR] Exception: {type(e).__name__}: {e}", flush=True)
         import traceback
@@ -438,6 +665,28 @@ async def general_qa(message: str = Form(...)):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@app.post("/general_question_answering/stream")
+async def general_qa_stream(message: str = Form(...)):
+    """Stream the answer as Server-Sent Events (token, sentence, done; see app/utils/sse.py)"""
+    from .all_task.pipeline import astream_llm_response
+
+    print(f"[DEBUG] Received streaming message: {message}", flush=True)
+    tokens = astream_llm_response(query=message, task="general_question_answering")
+    return sse_response(llm_sse_events(tokens))
+
+@app.post("/image_captioning/stream")
+async def image_captioning_stream(file: UploadFile = File(...)):
+    """Stream an image description as Server-Sent Events, sentence by sentence"""
+    from .all_task.pipeline import astream_llm_response
+
+    frame = Frame.from_bytes(await file.read())
+    tokens = astream_llm_response(
+        query="Describe this image.",
+        task="image_captioning",
+        base64_image=frame,
+    )
+    return sse_response(llm_sse_events(tokens))
+
 @app.get("/download_pdf")
 async def download_pdf(pdf_path: str):
     return FileResponse(pdf_path, media_type="application/pdf", filename="document.pdf")
@@ -500,7 +749,8 @@ async def spotify_callback(code: str):
     auth_header = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
     
     # Make the request
-    response = requests.post(
+    response = await run_blocking_io(
+        requests.post,
         token_url,
         data=data,
         headers={
@@ -555,7 +805,8 @@ async def spotify_refresh_token(request: Request):
     auth_header = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
     
     # Make the request
-    response = requests.post(
+    response = await run_blocking_io(
+        requests.post,
         token_url,
         data=data,
         headers={
@@ -1,6 +1,6 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.responses import JSONResponse
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import util
 import tempfile
 import numpy as np
 from typing import Dict, List, Tuple, Optional
@@ -12,8 +12,9 @@ from pydantic import BaseModel
 
 app = FastAPI()
 
-# Initialize sentence transformer
-embedder = SentenceTransformer('all-MiniLM-L6-v2')
+# Shared sentence transformer from the process-wide model registry
+from ..utils.embedders import embedder
+from ..utils.keyword_matcher import KeywordAutomaton
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -107,6 +108,18 @@ FEATURES = {
     },
 }
 
+def build_direct_phrase_matcher(features: Dict) -> KeywordAutomaton:
+    """Compile feature names, keywords and action phrases in the order they are checked"""
+    patterns = []
+    for feature, feature_config in features.items():
+        patterns.append((feature, (feature, CommandType.FEATURE, 1.0)))
+        patterns.extend((keyword, (feature, CommandType.FEATURE, 0.9)) for keyword in feature_config["keywords"])
+        for action, phrases in feature_config["actions"].items():
+            patterns.extend((phrase, (action, CommandType.ACTION, 0.85)) for phrase in phrases)
+    return KeywordAutomaton(patterns)
+
+direct_phrase_matcher = build_direct_phrase_matcher(FEATURES)
+
 # Create consolidated embeddings for each feature and action
 feature_embeddings = {}
 action_embeddings = {}
@@ -220,39 +233,19 @@ def find_best_action(transcript_embedding: torch.Tensor, feature: str) -> Tuple[
 
 def check_direct_phrase_match(transcript: str) -> Optional[MatchResult]:
     """Check for direct matches of feature or action phrases in the transcript"""
-    # First check for exact feature matches
-    for feature, config in FEATURES.items():
-        # Check feature name itself
-        if feature.lower() in transcript:
-            return MatchResult(
-                command=feature,
-                command_type=CommandType.FEATURE,
-                confidence=1.0,  # Direct match gets highest confidence
-                original_transcript=transcript
-            )
-        
-        # Check feature keywords
-        for keyword in config["keywords"]:
-            if keyword.lower() in transcript:
-                return MatchResult(
-                    command=feature,
-                    command_type=CommandType.FEATURE,
-                    confidence=0.9,  # Keyword match gets high confidence
-                    original_transcript=transcript
-                )
-        
-        # Check action phrases
-        for action, phrases in config["actions"].items():
-            for phrase in phrases:
-                if phrase.lower() in transcript:
-                    return MatchResult(
-                        command=action,
-                        command_type=CommandType.ACTION,
-                        confidence=0.85,  # Action phrase match gets good confidence
-                        original_transcript=transcript
-                    )
-    
-    return None
+    # One automaton pass; the earliest pattern in FEATURES order wins, exactly as
+    # the feature name -> keywords -> action phrases checks did per feature
+    match = direct_phrase_matcher.first(transcript)
+    if match is None:
+        return None
+
+    command, command_type, confidence = match.payload
+    return MatchResult(
+        command=command,
+        command_type=command_type,
+        confidence=confidence,
+        original_transcript=transcript
+    )
 
 @app.post("/transcribe_audio")
 async def voice_command(file: UploadFile = File(...), active_feature: Optional[str] = None):
@@ -1,8 +1,7 @@
-import openai  # Added import for OpenAI
-import os
 from fastapi import HTTPException
 from dotenv import load_dotenv # <--- 1. Thêm thư viện này
 from ..config import config
+from ..utils.llm_clients import llm_clients
 # 2. Load file .env ngay lập tức
 
 
@@ -26,7 +25,7 @@ def ask_general_question(question: str) -> str:
     try:
         
         # Use OpenAI instead of Gemini
-        client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        client = llm_clients.openai_client()
         
         response = client.chat.completions.create(
             model="gpt-4o-mini",
@@ -0,0 +1,128 @@
+"""
+Dynamic micro-batching of concurrent Whisper command transcriptions.
+
+Requests arriving within a short window are collected (up to a maximum batch
+size), their log-mel spectrograms are stacked and decoded in one batched
+Whisper pass, and each result is handed back to its own caller.
+"""
+import asyncio
+import time
+
+from ..config import config
+from .deepgram import transcribe_command, transcribe_command_batch
+from .executors import run_inference
+from .metrics import Histogram
+
+
+class TranscriptionBatcher:
+    def __init__(self, max_batch_size: int, window_ms: float, enabled: bool = True):
+        self.max_batch_size = max(1, max_batch_size)
+        self.window_seconds = window_ms / 1000
+        self.enabled = enabled
+        self._queue = None
+        self._worker = None
+        self._inflight = set()
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32])
+        self.queue_wait_ms = Histogram([5, 10, 25, 50, 100, 250])
+        self.latency_ms = Histogram([100, 250, 500, 1000, 2000, 5000])
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._collect())
+
+    async def transcribe(self, audio) -> dict:
+        """Transcribe one command clip (path or waveform), batched with its neighbours"""
+        if not self.enabled:
+            return await run_inference(transcribe_command, audio)
+
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        enqueued_at = time.perf_counter()
+        await self._queue.put((audio, future, enqueued_at))
+        try:
+            return await future
+        finally:
+            self.latency_ms.observe((time.perf_counter() - enqueued_at) * 1000)
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.window_seconds
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                # Decode in the background so the next batch can gather meanwhile;
+                # the inference pool bounds how many batches run at once.
+                task = loop.create_task(self._dispatch(batch))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+                batch = []
+        except asyncio.CancelledError:
+            # Requests gathered into a batch that was never dispatched
+            self._fail([future for _, future, _ in batch])
+            raise
+
+    @staticmethod
+    def _fail(futures):
+        for future in futures:
+            if not future.done():
+                future.set_exception(RuntimeError("Transcription service is shutting down"))
+
+    async def _dispatch(self, batch):
+        batch = [item for item in batch if not item[1].done()]  # Callers that gave up
+        if not batch:
+            return
+        now = time.perf_counter()
+        for _, _, enqueued_at in batch:
+            self.queue_wait_ms.observe((now - enqueued_at) * 1000)
+        self.batch_sizes.observe(len(batch))
+
+        try:
+            results = await run_inference(transcribe_command_batch, [audio for audio, _, _ in batch])
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_batch_size": self.max_batch_size,
+            "window_ms": self.window_seconds * 1000,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches_in_flight": len(self._inflight),
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+            "latency_ms": self.latency_ms.snapshot(),
+        }
+
+    def close(self):
+        """Stop batching; queued requests fail instead of waiting forever"""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future, _ = self._queue.get_nowait()
+                self._fail([future])
+
+
+asr_batcher = TranscriptionBatcher(
+    config.ASR_BATCH_MAX_SIZE,
+    config.ASR_BATCH_WINDOW_MS,
+    enabled=config.ASR_BATCHING,
+)
@@ -1,8 +1,14 @@
+import re
+import threading
 from collections import OrderedDict
-from sentence_transformers import SentenceTransformer, util
 
+from ..config import config
+from .cache import LRUCache
+from .embedders import SENTENCE_EMBEDDER
+from .intent_index import IntentIndex
+from .keyword_matcher import KeywordAutomaton
+from .model_manager import model_registry
 
-embedder = SentenceTransformer('all-MiniLM-L6-v2')
 
 # Initial unordered feature labels (prioritizing more distinct features first)
 raw_feature_labels = OrderedDict({
@@ -79,66 +85,139 @@ FEATURE_NAMES = { # Simplified for clarity, map name to canonical key
 # Use your original detailed keywords for semantic matching *if* it's not a navigation command
 FEATURE_KEYWORDS_FOR_SEMANTIC_MATCH = deduped_feature_labels # Use the deduplicated dict from your code
 
+# One precomputed index per (embedder, phrase table) pair, built on first use
+# (the app builds it during its startup warm-up, off the request path) and
+# rebuilt whenever the embedder is reloaded, since its vectors change with it
+_intent_indexes = {}  # (embedder, phrase table) -> (embedder version, index)
+_intent_indexes_lock = threading.Lock()
+
+def embedder_version():
+    """Version of the loaded sentence embedder (loads it if it was evicted)"""
+    model_registry.get(SENTENCE_EMBEDDER)
+    return model_registry.entry(SENTENCE_EMBEDDER).version
+
+def get_intent_index(embedder, feature_phrases):
+    key = (id(embedder), id(feature_phrases))
+    version = embedder_version()
+    cached = _intent_indexes.get(key)
+    if cached is None or cached[0] != version:
+        with _intent_indexes_lock:
+            cached = _intent_indexes.get(key)
+            if cached is None or cached[0] != version:
+                cached = _intent_indexes[key] = (version, IntentIndex(embedder, feature_phrases))
+    return cached[1]
+
+# --- Compiled keyword matchers (one pass over the transcript per lookup) ---
+# FEATURE_LABELS keywords -> label, in table order (first listed wins)
+label_keyword_matcher = KeywordAutomaton([], word_boundary=config.KEYWORD_MATCH_WORD_BOUNDARY)
+# NAVIGATION_TRIGGERS and FEATURE_NAMES aliases share one automaton
+navigation_matcher = KeywordAutomaton([])
+# Whole-transcript alias -> feature, for bare "music" / "news" style commands
+exact_feature_aliases = {}
+
+LABEL_TABLES_VERSION = 0
+
+def build_label_matchers():
+    """(Re)compile the matchers in place from the current label tables"""
+    label_keyword_matcher.build(
+        (keyword, label) for label, keywords in FEATURE_LABELS.items() for keyword in keywords
+    )
+    navigation_matcher.build(
+        [(trigger, ("trigger", trigger)) for trigger in NAVIGATION_TRIGGERS]
+        + [(alias, ("feature", feature_key)) for feature_key, aliases in FEATURE_NAMES.items() for alias in aliases]
+    )
+    aliases = {}
+    for feature_key, feature_aliases in FEATURE_NAMES.items():
+        for alias in feature_aliases:
+            aliases.setdefault(alias.lower(), feature_key)
+    exact_feature_aliases.clear()
+    exact_feature_aliases.update(aliases)
+
+build_label_matchers()
+
+def refresh_label_tables():
+    """Call after editing FEATURE_LABELS, NAVIGATION_TRIGGERS or FEATURE_NAMES"""
+    global LABEL_TABLES_VERSION
+    build_label_matchers()
+    with _intent_indexes_lock:
+        _intent_indexes.clear()  # Re-encoded on next use
+    LABEL_TABLES_VERSION += 1
+    routing_cache.clear()
+
+# --- Routing decision cache ---
+# Users repeat a handful of commands, so decisions are memoized per normalized
+# transcript. Keys carry routing_tables_version(), so editing the label tables
+# or swapping the embedder makes older entries unreachable.
+routing_cache = LRUCache(config.ROUTING_CACHE_SIZE, config.ROUTING_CACHE_TTL_SECONDS or None)
+
+_NON_WORD = re.compile(r"[^\w\s']+")
+
+def normalize_transcript(text):
+    """Lower-case, drop punctuation and collapse whitespace ("Stop!" -> "stop")"""
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+def routing_tables_version():
+    """Everything besides the transcript that a routing decision depends on"""
+    return LABEL_TABLES_VERSION, model_registry.entry(SENTENCE_EMBEDDER).version
+
 # --- Helper function to find navigation intent ---
 def find_navigation_intent(text):
     text_lower = text.lower()
-    for trigger in NAVIGATION_TRIGGERS:
-        trigger_pattern = trigger.lower() + r"\s+" # Trigger followed by space
-        if text_lower.startswith(trigger_pattern):
-            # Extract what comes after the trigger
-            potential_feature_phrase = text_lower[len(trigger_pattern):].strip()
-            # Check if the rest matches a feature name/alias
-            for feature_key, aliases in FEATURE_NAMES.items():
-                for alias in aliases:
-                    # Use simple startswith or exact match for the feature part
-                    # Or consider fuzzy matching if needed
-                    if potential_feature_phrase.startswith(alias.lower()):
-                         # Found a navigation command!
-                        return {
-                            "intent": "navigate",
-                            "target_feature": feature_key,
-                            "confidence": 0.95 # High confidence for explicit match
-                        }
-            # If trigger matched but no known feature followed, maybe it's ambiguous
-            # Or maybe it's a generic command like "start listening" (which might be 'Play' or 'Music')
-            # For now, we'll assume if no feature matches after trigger, it's not navigation
-            pass # Continue checking other triggers
+    hits = list(navigation_matcher.iter_matches(text_lower))
+
+    # Triggers at the very start, tried in NAVIGATION_TRIGGERS order
+    triggers = sorted((m for m in hits if m.payload[0] == "trigger" and m.start == 0), key=lambda m: m.priority)
+    for trigger in triggers:
+        rest = text_lower[trigger.end:]
+        if not rest[:1].isspace(): # Trigger followed by space
+            continue
+        # The rest must start with a feature name/alias (first in FEATURE_NAMES order wins)
+        offset = len(text_lower) - len(rest.lstrip())
+        feature = min(
+            (m for m in hits if m.payload[0] == "feature" and m.start == offset),
+            key=lambda m: m.priority,
+            default=None,
+        )
+        if feature:
+            # Found a navigation command!
+            return {
+                "intent": "navigate",
+                "target_feature": feature.payload[1],
+                "confidence": 0.95 # High confidence for explicit match
+            }
+        # If trigger matched but no known feature followed, maybe it's ambiguous
+        # Or maybe it's a generic command like "start listening" (which might be 'Play' or 'Music')
+        # For now, we'll assume if no feature matches after trigger, it's not navigation
 
     # Special case for commands that are just the feature name (less ideal but common)
     # This is lower confidence than explicit triggers
-    for feature_key, aliases in FEATURE_NAMES.items():
-        for alias in aliases:
-            if text_lower == alias.lower():
-                 return {
-                    "intent": "navigate",
-                    "target_feature": feature_key,
-                    "confidence": 0.75 # Lower confidence for implicit navigation
-                }
+    feature_key = exact_feature_aliases.get(text_lower)
+    if feature_key:
+        return {
+            "intent": "navigate",
+            "target_feature": feature_key,
+            "confidence": 0.75 # Lower confidence for implicit navigation
+        }
 
     return None # No clear navigation intent found
 
 # --- Helper function for Semantic Query Routing ---
 def route_query_semantically(query_text, embedder, feature_keywords):
-    query_embed = embedder.encode(query_text, convert_to_tensor=True)
-    best_match_feature, best_score = None, -1
-
-    # Match against the *keywords* associated with each feature
-    for feature_key, keywords in feature_keywords.items():
-        # Maybe average embeddings of keywords, or check against each?
-        # Checking against each is simpler for now
-        feature_avg_score = 0
-        if not keywords: continue # Skip features with no keywords
-
-        for keyword in keywords:
-            keyword_embed = embedder.encode(keyword, convert_to_tensor=True)
-            score = util.cos_sim(query_embed, keyword_embed).item()
-            feature_avg_score += score
-            # Optional: Keep track of the best *single* keyword match score too
-
-        feature_avg_score /= len(keywords) # Average score for the feature
-
-        if feature_avg_score > best_score:
-            best_match_feature, best_score = feature_key, feature_avg_score
+    """Route a query to a feature, reusing the decision for repeated queries"""
+    # The normalized text only keys the cache; the query is embedded as given,
+    # like route_voice_command does for commands
+    key = ("query", normalize_transcript(query_text), id(embedder), id(feature_keywords), routing_tables_version())
+    decision = routing_cache.get(key)
+    if decision is None:
+        decision = _route_query_semantically(query_text, embedder, feature_keywords)
+        routing_cache.put(key, decision)
+    return {**decision, "query": query_text}
+
+def _route_query_semantically(query_text, embedder, feature_keywords):
+    # Match against the *keywords* associated with each feature, averaging
+    # the similarity over all keywords of a feature
+    index = get_intent_index(embedder, feature_keywords)
+    best_match_feature, best_score = index.best_match(query_text, reduction="mean")
 
     print(f"Best match feature: {best_match_feature}, Score: {best_score}")
     # Add a threshold - don't route if confidence is too low
@@ -0,0 +1,165 @@
+"""
+In-memory audio ingestion for uploads.
+
+Upload bytes are piped through ffmpeg straight into a 16 kHz mono float32
+NumPy buffer (the format Whisper consumes), so no temp file is written or
+left behind on the request path.
+
+Oversized uploads are refused by UploadSizeLimit before the multipart body is
+received; read_upload re-checks the file part itself once it is parsed.
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+from ..config import config
+from .executors import run_blocking_io
+from .vad import SAMPLE_RATE
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Room for multipart boundaries, part headers and small form fields around the audio
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def check_ffmpeg() -> str:
+    """Path of the ffmpeg binary uploads are decoded with (raises if it is not installed)"""
+    path = shutil.which("ffmpeg")
+    if path is None:
+        raise RuntimeError("ffmpeg is not installed or not on PATH; audio uploads cannot be decoded")
+    return path
+
+
+def ffmpeg_decode_command(source: str, sample_rate: int = SAMPLE_RATE) -> list:
+    # Same conversion as whisper.load_audio, reading from `source` ("pipe:0" or a path)
+    return [
+        "ffmpeg", "-nostdin", "-threads", "0", "-i", source,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sample_rate),
+        "pipe:1",
+    ]
+
+
+class UploadSizeLimit:
+    """ASGI middleware: 413 for requests to `paths` whose body exceeds the upload limit.
+
+    Starlette spools the whole multipart body before an endpoint runs, so the
+    limit has to apply here: a Content-Length over it is refused before any of
+    the body is read, and bodies sent without one are cut off as soon as they
+    pass it.
+    """
+
+    def __init__(self, app, paths, max_bytes: int | None = None):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_bytes or config.AUDIO_MAX_UPLOAD_BYTES
+
+    async def _reject(self, scope, send):
+        response = JSONResponse({"detail": f"Audio upload exceeds {self.max_bytes} bytes"}, status_code=413)
+        await response(scope, None, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.max_bytes + MULTIPART_OVERHEAD_BYTES
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            await self._reject(scope, send)
+            return
+
+        received, rejected = 0, False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            message = await receive()
+            if message["type"] == "http.request" and not rejected:
+                received += len(message.get("body", b""))
+                if received > limit:
+                    rejected = True
+                    await self._reject(scope, send)
+                    # The endpoint sees a client that went away and stops reading
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            if not rejected:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
+
+
+async def read_upload(file: UploadFile, max_bytes: int | None = None) -> bytes:
+    """Read a parsed upload in chunks, rejecting it with 413 if it exceeds `max_bytes`.
+
+    The request body is already received by now; UploadSizeLimit is what
+    stops an oversized upload before it costs bandwidth and disk.
+    """
+    max_bytes = max_bytes or config.AUDIO_MAX_UPLOAD_BYTES
+    chunks, total = [], 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        total += len(chunk)
+        if total > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Audio upload exceeds {max_bytes} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def _run_ffmpeg(command: list, data: bytes | None = None):
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdin=asyncio.subprocess.PIPE if data is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate(input=data)
+    return process.returncode, stdout, stderr
+
+
+def _seekable_decode_path(data: bytes) -> str:
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        tmp.write(data)
+        return tmp.name
+
+
+async def decode_audio_bytes(data: bytes, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Decode any ffmpeg-readable audio to a mono float32 waveform at `sample_rate`"""
+    returncode, stdout, stderr = await _run_ffmpeg(ffmpeg_decode_command("pipe:0", sample_rate), data)
+
+    if returncode != 0 or not stdout:
+        # Some containers (e.g. MP4 with a trailing moov atom) need a seekable
+        # input, so retry once from a temp file that is removed right after.
+        path = await run_blocking_io(_seekable_decode_path, data)
+        try:
+            returncode, stdout, stderr = await _run_ffmpeg(ffmpeg_decode_command(path, sample_rate))
+        finally:
+            os.unlink(path)
+
+    if returncode != 0:
+        raise RuntimeError(f"Failed to decode audio: {stderr.decode(errors='ignore')[-500:]}")
+
+    return np.frombuffer(stdout, np.int16).astype(np.float32) / 32768.0
+
+
+async def decode_upload(file: UploadFile, max_bytes: int | None = None) -> np.ndarray:
+    """Read an audio upload (size-limited) and decode it in memory for Whisper"""
+    data = await read_upload(file, max_bytes)
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty audio upload.")
+    try:
+        return await decode_audio_bytes(data)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        raise HTTPException(status_code=400, detail="Could not decode the uploaded audio.")
+    except OSError as e:
+        # ffmpeg missing or not executable: a server problem, not a bad upload
+        print(f"❌ Could not run ffmpeg: {e}")
+        raise HTTPException(status_code=503, detail="Audio decoding is unavailable.")
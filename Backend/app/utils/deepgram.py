@@ -3,39 +3,70 @@ import os
 import tempfile
 from typing import Dict, Any
 
-# Try to import whisper, but don't fail if it's not available
-try:
-    import whisper
-except ImportError:
-    whisper = None
-
 import time
 
+from .model_manager import model_registry
+from .vad import SAMPLE_RATE, trim_silence
+
+# openai-whisper pulls in torch, so it is imported on first use rather than at
+# app import; stays None if the package is not installed
+whisper = None
+
+def import_whisper():
+    global whisper
+    if whisper is None:
+        try:
+            import whisper as whisper_module
+        except ImportError:
+            return None
+        whisper = whisper_module
+    return whisper
+
+
+def whisper_loader(model_name: str):
+    def load():
+        if import_whisper() is None:
+            raise RuntimeError("openai-whisper is not installed")
+        return whisper.load_model(model_name)
+    return load
+
+
+# Process-wide Whisper model, loaded once and replaced only via swap_whisper_model().
+# It sits on every voice command's critical path, so it is never evicted.
+whisper_model = model_registry.register("whisper", whisper_loader(config.WHISPER_MODEL), evictable=False)
+
+
+def swap_whisper_model(model_name: str | None = None):
+    """Hot-swap the Whisper weights without blocking in-flight transcriptions"""
+    loader = whisper_loader(model_name) if model_name else None
+    whisper_model.swap(loader)
+    return whisper_model.stats()
+
+
 def transcribe_audio(audio_file_path):
-    # Import the whisper model when needed to avoid circular import issues
     try:
-        from ..main import whisper_model
-        model = whisper_model
-    except ImportError:
-        print("❌ Failed to import whisper model from main")
-        return {"error": "Failed to import whisper model from main."}
-    
+        model = whisper_model.get()
+    except Exception:
+        model = None
+
     # Check if whisper is available
-    if whisper is None or model is None:
+    if import_whisper() is None or model is None:
         print("❌ Whisper model not available")
         return {"error": "Whisper model not available. Please install openai-whisper."}
     
     start_time = time.time()
     try:
-        # Check if the audio file exists
-        if not os.path.exists(audio_file_path):
-            print("❌ Audio file not found:", audio_file_path)
-            return {"error": "Audio file not found."}
+        # Decoded waveforms (see utils/audio_io.py) go straight to Whisper
+        if isinstance(audio_file_path, str):
+            # Check if the audio file exists
+            if not os.path.exists(audio_file_path):
+                print("❌ Audio file not found:", audio_file_path)
+                return {"error": "Audio file not found."}
 
-        # Check if the file is a valid audio file
-        if not audio_file_path.endswith(('.wav', '.mp3', '.webm', '.m4a', '.mp4', '.mpeg', '.mpga', '.ogg', '.flac')):
-            print("❌ Invalid audio file format:", audio_file_path)
-            return {"error": "Invalid audio file format."}
+            # Check if the file is a valid audio file
+            if not audio_file_path.endswith(('.wav', '.mp3', '.webm', '.m4a', '.mp4', '.mpeg', '.mpga', '.ogg', '.flac')):
+                print("❌ Invalid audio file format:", audio_file_path)
+                return {"error": "Invalid audio file format."}
 
         print("🔄 Starting transcription with Whisper model...")
         # Transcribe audio file using local Whisper model
@@ -57,4 +88,150 @@ def transcribe_audio(audio_file_path):
         print("❌ Exception:", str(e))
         import traceback
         traceback.print_exc()
-        return {"error": f"An error occurred during transcription: {str(e)}"}
\ No newline at end of file
+        return {"error": f"An error occurred during transcription: {str(e)}"}
+
+
+def command_prompt_terms() -> list[str]:
+    """Command vocabulary, most important first: navigation triggers, then feature
+    names round-robin (every feature's first alias, then every second one, ...)"""
+    from .audio import FEATURE_NAMES, NAVIGATION_TRIGGERS
+
+    terms = list(NAVIGATION_TRIGGERS)
+    for rank in range(max(len(aliases) for aliases in FEATURE_NAMES.values())):
+        terms.extend(aliases[rank] for aliases in FEATURE_NAMES.values() if rank < len(aliases))
+    return list(dict.fromkeys(term.lower() for term in terms))
+
+
+def prompt_token_count(tokenizer, prompt: str) -> int:
+    """Tokens Whisper spends on a text prompt (it encodes " " + prompt)"""
+    return len(tokenizer.encode(" " + prompt.strip()))
+
+
+def build_command_prompt(tokenizer, max_tokens: int) -> str:
+    """Vocabulary prompt of at most `max_tokens` tokens.
+
+    Whisper keeps only the last n_text_ctx // 2 - 1 prompt tokens, so an
+    over-long prompt silently loses its beginning. Terms are added in
+    priority order and the prompt stops before it would exceed the budget.
+    """
+    terms = []
+    for term in command_prompt_terms():
+        candidate = "Voice commands: " + ", ".join(terms + [term]) + "."
+        if prompt_token_count(tokenizer, candidate) > max_tokens:
+            break
+        terms.append(term)
+    if not terms:
+        raise ValueError(f"A {max_tokens}-token prompt cannot hold any voice command")
+    return "Voice commands: " + ", ".join(terms) + "."
+
+
+_command_prompts = {}  # (tokenizer, token budget) -> prompt
+
+def command_vocabulary_prompt(model) -> str:
+    """Prompt text that biases decoding towards the known command vocabulary (built once per model)"""
+    tokenizer = whisper.tokenizer.get_tokenizer(
+        model.is_multilingual,
+        num_languages=model.num_languages,
+        language=config.WHISPER_COMMAND_LANGUAGE or None,
+        task="transcribe",
+    )
+    max_tokens = min(config.WHISPER_COMMAND_PROMPT_MAX_TOKENS, model.dims.n_text_ctx // 2 - 1)
+    key = (id(tokenizer), max_tokens)
+    if key not in _command_prompts:
+        _command_prompts[key] = build_command_prompt(tokenizer, max_tokens)
+    return _command_prompts[key]
+
+
+def command_decoding_options(model, max_tokens=None, vocabulary_bias=None):
+    """Single greedy decode, no timestamps and a hard cap on generated tokens"""
+    if vocabulary_bias is None:
+        vocabulary_bias = config.WHISPER_COMMAND_VOCAB_BIAS
+    return whisper.DecodingOptions(
+        task="transcribe",
+        language=config.WHISPER_COMMAND_LANGUAGE or None,
+        temperature=0.0,
+        sample_len=max_tokens or config.WHISPER_COMMAND_MAX_TOKENS,
+        without_timestamps=True,
+        prompt=command_vocabulary_prompt(model) if vocabulary_bias else None,
+        fp16=model.device.type == "cuda",
+    )
+
+
+def command_mel(model, audio):
+    """Trim silence and return the 30 s log-mel window Whisper's encoder expects"""
+    if isinstance(audio, str):
+        audio = whisper.load_audio(audio)
+    speech = trim_silence(audio)
+    if speech.size == 0:
+        return None, 0.0
+    mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(speech), model.dims.n_mels)
+    return mel.to(model.device), len(speech) / SAMPLE_RATE
+
+
+def transcribe_command_batch(audios, max_tokens=None, vocabulary_bias=None):
+    """
+    Fast path for short voice commands (a few seconds of speech each).
+
+    Unlike transcribe_audio this skips the long-form sliding window, the
+    temperature fallback and previous-text conditioning: silence is trimmed,
+    then a single greedy, token-capped decode runs over one window per clip.
+    All clips are decoded together as one batch.
+
+    Args:
+        audios: Paths to audio files and/or 16 kHz float32 waveforms.
+        max_tokens: Cap on decoded tokens (defaults to WHISPER_COMMAND_MAX_TOKENS).
+        vocabulary_bias: Prompt with the command vocabulary (defaults to WHISPER_COMMAND_VOCAB_BIAS).
+
+    Returns:
+        One {"transcript": ...} or {"error": ...} dict per input, in order;
+        a clip that cannot be decoded gets an error without failing the others.
+    """
+    try:
+        model = whisper_model.get()
+    except Exception:
+        model = None
+
+    if import_whisper() is None or model is None:
+        print("❌ Whisper model not available")
+        return [{"error": "Whisper model not available. Please install openai-whisper."} for _ in audios]
+
+    start_time = time.time()
+    try:
+        results = [{"error": "No speech detected."} for _ in audios]
+        mels, positions, speech_seconds = [], [], 0.0
+        for i, audio in enumerate(audios):
+            # A clip that cannot be decoded only fails its own caller, not the batch
+            try:
+                mel, seconds = command_mel(model, audio)
+            except Exception as e:
+                print(f"❌ Could not prepare clip {i}: {e}")
+                results[i] = {"error": f"Could not decode audio: {str(e)}"}
+                continue
+            if mel is not None:
+                mels.append(mel)
+                positions.append(i)
+                speech_seconds += seconds
+
+        if mels:
+            import torch
+            options = command_decoding_options(model, max_tokens, vocabulary_bias)
+            decoded = whisper.decode(model, torch.stack(mels), options)
+            for i, result in zip(positions, decoded):
+                transcript = result.text.strip()
+                results[i] = {"transcript": transcript} if transcript else {"error": "No transcript detected."}
+
+        duration = time.time() - start_time
+        print(f"⏱️  Command transcription of {len(audios)} clip(s), {speech_seconds:.1f}s speech, completed in {duration:.2f} seconds")
+        print("🎙️ Transcripts:", [r.get("transcript") for r in results])
+        return results
+
+    except Exception as e:
+        print("❌ Exception:", str(e))
+        import traceback
+        traceback.print_exc()
+        return [{"error": f"An error occurred during transcription: {str(e)}"} for _ in audios]
+
+
+def transcribe_command(audio, max_tokens=None, vocabulary_bias=None):
+    """Transcribe a single short voice command, see transcribe_command_batch"""
+    return transcribe_command_batch([audio], max_tokens, vocabulary_bias)[0]
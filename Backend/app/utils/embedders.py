@@ -0,0 +1,107 @@
+"""
+Shared sentence embedder used for intent routing.
+
+Every module goes through the same registry entry, so each worker process
+holds a single copy of the model however many modules use it. The backend is
+chosen by EMBEDDER_BACKEND:
+    torch - sentence-transformers on PyTorch (default)
+    onnx  - the same MiniLM exported to ONNX and dynamically int8-quantized,
+            run with ONNX Runtime on CPU (see export_onnx_embedder.py)
+Both expose the same `encode` contract.
+"""
+import os
+
+import numpy as np
+
+from ..config import config
+from .model_manager import model_registry
+
+SENTENCE_EMBEDDER = "sentence-embedder"
+
+
+class OnnxSentenceEmbedder:
+    """MiniLM sentence embeddings via ONNX Runtime, mirroring SentenceTransformer.encode"""
+
+    def __init__(self, model_dir: str, max_seq_length: int = 256, threads: int = 0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, "model_int8.onnx"), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _embed_batch(self, sentences):
+        encodings = self.tokenizer.encode_batch(sentences)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": attention_mask,
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        token_embeddings = self.session.run(None, {k: v for k, v in feeds.items() if k in self.input_names})[0]
+
+        # Mean pooling over real tokens, then L2 normalisation: the same
+        # Pooling + Normalize modules all-MiniLM-L6-v2 ships with
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def encode(
+        self,
+        sentences,
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        convert_to_tensor: bool = False,
+        normalize_embeddings: bool = False,
+        **kwargs,
+    ):
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        batches = [self._embed_batch(sentences[i:i + batch_size]) for i in range(0, len(sentences), batch_size)]
+        embeddings = np.concatenate(batches).astype(np.float32) if batches else np.zeros((0, 384), np.float32)
+        if single:
+            embeddings = embeddings[0]
+
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(embeddings)
+        return embeddings
+
+
+def load_sentence_transformer():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(config.SENTENCE_EMBEDDER_MODEL)
+
+
+def load_onnx_embedder():
+    return OnnxSentenceEmbedder(config.EMBEDDER_ONNX_DIR, threads=config.EMBEDDER_ONNX_THREADS)
+
+
+EMBEDDER_BACKENDS = {
+    "torch": load_sentence_transformer,
+    "onnx": load_onnx_embedder,
+}
+
+
+def embedder_loader(backend: str):
+    if backend not in EMBEDDER_BACKENDS:
+        raise ValueError(f"Unsupported embedder backend: {backend}")
+    return EMBEDDER_BACKENDS[backend]
+
+
+# Evictable under MODEL_MEMORY_BUDGET_MB: callers go through the handle below, so
+# an unloaded embedder is simply reloaded (same weights) on its next use
+model_registry.register(SENTENCE_EMBEDDER, embedder_loader(config.EMBEDDER_BACKEND), evictable=True)
+
+# Lazily resolved stand-in exposing the usual `encode` API
+embedder = model_registry.handle(SENTENCE_EMBEDDER)
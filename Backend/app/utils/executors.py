@@ -0,0 +1,194 @@
+"""
+Bounded worker pools that keep blocking work off the asyncio event loop.
+
+CPU-bound model inference (Whisper, sentence embeddings) and blocking network
+or disk calls (LLM SDKs, temp files) run on separate pools, so a slow
+transcription cannot starve LLM calls and neither can freeze the loop.
+Pure-Python CPU work that holds the GIL (article parsing and NLP) runs in a
+process pool instead, so several jobs use several cores.
+"""
+import asyncio
+import functools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from ..config import config
+
+
+class WorkloadExecutor:
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.queued = 0
+        self.running = 0
+        self.max_queue_depth = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def run(self, fn, *args, **kwargs):
+        """Run `fn(*args, **kwargs)` on this pool and await its result"""
+        loop = asyncio.get_running_loop()
+        enqueued_at = time.perf_counter()
+        state = {"started": False, "cancelled": False}
+
+        with self._lock:
+            self.submitted += 1
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+
+        def task():
+            with self._lock:
+                if state["cancelled"]:
+                    return None
+                state["started"] = True
+                waited = time.perf_counter() - enqueued_at
+                self.queued -= 1
+                self.running += 1
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                with self._lock:
+                    self.failed += 1
+                raise
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+
+        try:
+            return await loop.run_in_executor(self._pool, task)
+        except asyncio.CancelledError:
+            # The caller went away before a worker picked the task up
+            with self._lock:
+                if not state["started"]:
+                    state["cancelled"] = True
+                    self.queued -= 1
+            raise
+
+    def stats(self) -> dict:
+        with self._lock:
+            started = self.completed + self.running
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self.queued,
+                "running": self.running,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "max_queue_depth": self.max_queue_depth,
+                "avg_wait_ms": round(1000 * self.total_wait_seconds / started, 2) if started else 0.0,
+                "max_wait_ms": round(1000 * self.max_wait_seconds, 2),
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ProcessWorkloadExecutor:
+    """Process pool for GIL-bound Python work; `fn` and its arguments must be picklable.
+
+    Workers are spawned (not forked from the threaded server) on first use.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.total_seconds = 0.0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    async def run(self, fn, *args, **kwargs):
+        """Run `fn(*args, **kwargs)` in a worker process and await its result"""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self._executor(), functools.partial(fn, *args, **kwargs))
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.total_seconds += time.perf_counter() - start
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "started": self._pool is not None,
+                "in_flight": self.in_flight,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_ms": round(1000 * self.total_seconds / self.completed, 2) if self.completed else 0.0,
+            }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+inference_executor = WorkloadExecutor("inference", config.INFERENCE_WORKERS)
+blocking_io_executor = WorkloadExecutor("blocking-io", config.BLOCKING_IO_WORKERS)
+cpu_process_executor = ProcessWorkloadExecutor("cpu-process", config.CPU_PROCESS_WORKERS)
+
+
+async def run_inference(fn, *args, **kwargs):
+    """Run CPU-bound model inference (Whisper, embedder) off the event loop"""
+    return await inference_executor.run(fn, *args, **kwargs)
+
+
+async def run_blocking_io(fn, *args, **kwargs):
+    """Run blocking network / disk calls (LLM SDKs, temp files) off the event loop"""
+    return await blocking_io_executor.run(fn, *args, **kwargs)
+
+
+async def run_cpu_bound(fn, *args, **kwargs):
+    """Run GIL-bound Python work (article parsing/NLP) in the process pool.
+
+    Falls back to the blocking-io threads when CPU_PROCESS_WORKERS is 0.
+    """
+    if cpu_process_executor.max_workers <= 0:
+        return await blocking_io_executor.run(fn, *args, **kwargs)
+    return await cpu_process_executor.run(fn, *args, **kwargs)
+
+
+def executor_stats() -> dict:
+    return {
+        inference_executor.name: inference_executor.stats(),
+        blocking_io_executor.name: blocking_io_executor.stats(),
+        cpu_process_executor.name: cpu_process_executor.stats(),
+    }
+
+
+def shutdown_executors():
+    inference_executor.shutdown()
+    blocking_io_executor.shutdown()
+    cpu_process_executor.shutdown()
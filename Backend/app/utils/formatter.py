@@ -1,20 +1,14 @@
-import openai  # Added import for OpenAI
 from ast import List
 import re
 from tempfile import NamedTemporaryFile
-import os
 import logging
 from fpdf import FPDF
-import asyncio
 from ..config import config
+from .executors import run_blocking_io
+from .frame import Frame
+from .llm_clients import llm_clients
 from gtts import gTTS
 
-# --- Mới: Thêm các thư viện cho Google Gemini và xử lý ảnh ---
-import base64
-import io
-from PIL import Image
-# -------------------------------------------------------------
-
 # Cấu hình Google API một lần khi import module
 
 def segment_text_by_sentence(text):
@@ -45,20 +39,9 @@ def create_pdf(text: str, output_path: str):
     pdf.output(output_path)
 
 async def create_pdf_async(text: str, pdf_path: str):
-    await asyncio.to_thread(create_pdf, text, pdf_path)
-
-def format_response_distance_estimate_with_openai(response, transcribe, base64_image):
-    """
-    (Tên hàm giữ nguyên để tránh sửa main.py, nhưng bên trong dùng Google Gemini)
-    """
-    try:
-        if response is None or len(response) == 0:
-            return "No objects detected at the moment."
-            
-        logging.info(f"Processing response with OpenAI: {response}")
+    await run_blocking_io(create_pdf, text, pdf_path)
 
-        # System Prompt
-        system_prompt = """
+DISTANCE_ESTIMATE_SYSTEM_PROMPT = """
             You are an expert in guiding visually impaired individuals to move safely and retrieve objects. Your task is to convert object detection data into clear, detailed, and safe movement instructions in English. Include the following:
 
             - Identify and describe the location of the requested object.
@@ -75,35 +58,81 @@ def format_response_distance_estimate_with_openai(response, transcribe, base64_i
             4. The [object] is located at [final position]."
         """
 
+PRODUCT_RECOGNITION_SYSTEM_PROMPT = """
+        Your task is to convert product information into a detailed, easy-to-understand, and engaging paragraph in English.
+
+        Requirements:
+        - Provide a full description of the product.
+        - Explain nutritional information in a simple way.
+        - Evaluate the nutritional value and potential use.
+        - Use a friendly, professional tone.
+
+        Example format:
+        "[Product Name] by [Brand Name] – A unique culinary experience!
+
+        Product Details:
+        - Type: [Detailed description]
+        - Weight: [Weight]
+        - Category: [Relevant categories]
+
+        Nutritional Value (In-depth analysis):
+        [Detailed breakdown of energy, fat, carbohydrates, and protein]"
+        """
+
+
+def distance_estimate_messages(response, transcribe, base64_image):
+    """Chat messages for the distance formatter; None if the image cannot be decoded.
+
+    `base64_image` may also be the request's Frame, whose prepared copy is then reused.
+    """
+    # Decode, downscale and re-encode the frame for the distance task
+    try:
+        prepared, img_str = Frame.coerce(base64_image).prepared("distance_estimation")
+    except Exception as img_err:
+        logging.error(f"Error decoding image: {img_err}")
+        return None
+
+    # Tạo nội dung prompt (Text + Image)
+    user_prompt = f"Object Detection Data: {str(response)}\nUser Transcription/Request: {transcribe}"
+    
+
+    return [
+        {"role": "system", "content": DISTANCE_ESTIMATE_SYSTEM_PROMPT},
+        {"role": "user", "content": [
+            {"type": "text", "text": user_prompt},
+            {"type": "image_url", "image_url": {"url": f"data:{prepared.mime};base64,{img_str}"}}
+        ]}
+    ]
+
+
+def product_recognition_messages(response):
+    return [
+        {"role": "system", "content": PRODUCT_RECOGNITION_SYSTEM_PROMPT},
+        {"role": "user", "content": str(response)}
+    ]
+
+
+def format_response_distance_estimate_with_openai(response, transcribe, base64_image):
+    """
+    (Tên hàm giữ nguyên để tránh sửa main.py, nhưng bên trong dùng Google Gemini)
+    """
+    try:
+        if response is None or len(response) == 0:
+            return "No objects detected at the moment."
+            
+        logging.info(f"Processing response with OpenAI: {response}")
+
         # Use OpenAI instead of Gemini
-        client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
-        # Xử lý ảnh: Decode Base64 thành PIL Image
-        try:
-            image_data = base64.b64decode(base64_image)
-            image = Image.open(io.BytesIO(image_data))
-        except Exception as img_err:
-            logging.error(f"Error decoding image: {img_err}")
-            return "Error processing the image data."
+        client = llm_clients.openai_client()
 
-        # Tạo nội dung prompt (Text + Image)
-        user_prompt = f"Object Detection Data: {str(response)}\nUser Transcription/Request: {transcribe}"
-        
-        # Convert image to base64 for OpenAI
-        buffered = io.BytesIO()
-        image.save(buffered, format="JPEG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
+        messages = distance_estimate_messages(response, transcribe, base64_image)
+        if messages is None:
+            return "Error processing the image data."
         
         # Gửi request đến OpenAI
         response_openai = client.chat.completions.create(
             model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": [
-                    {"type": "text", "text": user_prompt},
-                    {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{img_str}"}}
-                ]}
-            ],
+            messages=messages,
             max_tokens=500
         )
 
@@ -116,44 +145,20 @@ def format_response_distance_estimate_with_openai(response, transcribe, base64_i
     except Exception as e:
         logging.error(f"Unexpected error in distance estimation (OpenAI): {e}")
         return str(response)
-    
+
+
 def format_response_product_recognition_with_openai(response):
     """
     (Tên hàm giữ nguyên để tránh sửa main.py, nhưng bên trong dùng Google Gemini)
     """
     try:
-        # System Prompt
-        system_prompt = """
-        Your task is to convert product information into a detailed, easy-to-understand, and engaging paragraph in English.
-
-        Requirements:
-        - Provide a full description of the product.
-        - Explain nutritional information in a simple way.
-        - Evaluate the nutritional value and potential use.
-        - Use a friendly, professional tone.
-
-        Example format:
-        "[Product Name] by [Brand Name] – A unique culinary experience!
-
-        Product Details:
-        - Type: [Detailed description]
-        - Weight: [Weight]
-        - Category: [Relevant categories]
-
-        Nutritional Value (In-depth analysis):
-        [Detailed breakdown of energy, fat, carbohydrates, and protein]"
-        """
-
         # Use OpenAI instead of Gemini
-        client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        client = llm_clients.openai_client()
         
         # Gửi request đến OpenAI
         response_openai = client.chat.completions.create(
             model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": str(response)}
-            ],
+            messages=product_recognition_messages(response),
             max_tokens=500
         )
 
@@ -165,6 +170,7 @@ def format_response_product_recognition_with_openai(response):
         logging.error(f"Unexpected error in product information processing (OpenAI): {e}")
         return str(response)
 
+
 def format_response_music_detection_with_openai(response):
     pass
 
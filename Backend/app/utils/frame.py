@@ -0,0 +1,79 @@
+"""
+One camera frame shared by every stage of a request.
+
+A vision request used to decode the same image several times: base64 for the
+barcode scan, cv2.imdecode, PIL again in the formatter, then base64 once more
+for the LLM. A Frame is created once per request and each representation is
+produced on first use and kept:
+    raw       - encoded image bytes
+    base64    - base64 of raw (or the string the frame was created from)
+    array     - BGR NumPy array (cv2.imdecode)
+    gray      - grayscale view of array (barcode scanning)
+    dhash     - perceptual hash for the frame cache
+    prepared(task) - downscaled/re-encoded copy for a vision-LLM call
+"""
+import base64 as b64
+from functools import cached_property
+
+
+class Frame:
+    def __init__(self, raw: bytes | None = None, base64: str | None = None):
+        if raw is None and base64 is None:
+            raise ValueError("Frame needs raw bytes or a base64 string")
+        if raw is not None:
+            self.__dict__["raw"] = raw
+        if base64 is not None:
+            self.__dict__["base64"] = base64
+        self._prepared = {}  # ImageProfile -> (PreparedImage, base64)
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "Frame":
+        return cls(raw=raw)
+
+    @classmethod
+    def from_base64(cls, base64_image: str) -> "Frame":
+        return cls(base64=base64_image)
+
+    @classmethod
+    def coerce(cls, image) -> "Frame | None":
+        """Accept a Frame, a base64 string or None (keeps the old base64 call sites working)"""
+        if image is None or isinstance(image, Frame):
+            return image
+        return cls.from_base64(image)
+
+    @cached_property
+    def raw(self) -> bytes:
+        return b64.b64decode(self.__dict__["base64"])
+
+    @cached_property
+    def base64(self) -> str:
+        return b64.b64encode(self.__dict__["raw"]).decode("utf-8")
+
+    @cached_property
+    def array(self):
+        import cv2
+        import numpy as np
+        image = cv2.imdecode(np.frombuffer(self.raw, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("Could not decode image")
+        return image
+
+    @cached_property
+    def gray(self):
+        import cv2
+        return cv2.cvtColor(self.array, cv2.COLOR_BGR2GRAY)
+
+    @cached_property
+    def dhash(self) -> int:
+        # Hashed from a reduced-scale decode of raw, far cheaper than a full decode
+        from .frame_cache import dhash
+        return dhash(self.raw)
+
+    def prepared(self, task: str):
+        """(PreparedImage, base64) for `task`; shared by tasks with the same profile"""
+        from .image_prep import prepare_image, profile_for
+        profile = profile_for(task)
+        if profile not in self._prepared:
+            prepared = prepare_image(self.raw, task)
+            self._prepared[profile] = (prepared, b64.b64encode(prepared.data).decode("utf-8"))
+        return self._prepared[profile]
@@ -0,0 +1,118 @@
+"""
+Vision result cache keyed by a perceptual hash of the camera frame.
+
+The camera keeps sending near-identical frames of an unchanged scene. Each
+frame is reduced to a 64-bit difference hash (dHash); a request whose hash is
+within `max_distance` bits (or the task's own, stricter limit) of a cached
+frame for the same task and query gets the cached answer instead of a new
+vision-LLM call. Entries expire after a
+short TTL (the scene may change) and the least recently used are evicted
+beyond `maxsize`.
+"""
+import io
+import threading
+import time
+from collections import OrderedDict
+
+from ..config import config
+
+
+def dhash(image_bytes: bytes, hash_size: int = 8) -> int:
+    """Difference hash: compare horizontally adjacent pixels of a tiny grayscale thumbnail"""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        # JPEG frames are decoded straight at a reduced scale
+        image.draft("L", (hash_size * 4, hash_size * 4))
+        thumbnail = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = list(thumbnail.getdata())
+
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+def frame_dhash(frame):
+    """The frame's dHash, or None if it cannot be decoded (blocking)"""
+    try:
+        return frame.dhash
+    except Exception as e:
+        print(f"⚠️  Could not hash frame: {e}")
+        return None
+
+
+class FrameCache:
+    def __init__(self, max_distance: int, maxsize: int, ttl_seconds: float | None = None, task_max_distance: dict | None = None):
+        self.max_distance = max_distance
+        self.task_max_distance = task_max_distance or {}  # task -> max_distance override
+        self.maxsize = maxsize
+        self.enabled = maxsize > 0
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # (task, query, frame_hash) -> (result, stored_at), LRU order
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def max_distance_for(self, task: str) -> int:
+        return self.task_max_distance.get(task, self.max_distance)
+
+    def lookup(self, task: str, query: str, frame_hash: int):
+        """Cached result for the closest matching frame, or None"""
+        now = time.monotonic()
+        with self._lock:
+            self.lookups += 1
+            best_key, best_distance = None, self.max_distance_for(task) + 1
+            for key, (_, stored_at) in list(self._entries.items()):
+                if self.ttl_seconds is not None and now - stored_at > self.ttl_seconds:
+                    del self._entries[key]
+                    self.expired += 1
+                    continue
+                if key[0] != task or key[1] != query:
+                    continue
+                distance = (key[2] ^ frame_hash).bit_count()
+                if distance < best_distance:
+                    best_key, best_distance = key, distance
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            return self._entries[best_key][0]
+
+    def store(self, task: str, query: str, frame_hash: int, result):
+        if not self.enabled or not result:
+            return
+        with self._lock:
+            key = (task, query, frame_hash)
+            self._entries[key] = (result, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "max_distance": self.max_distance,
+                "task_max_distance": self.task_max_distance,
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "misses": self.lookups - self.hits,
+                "hit_rate": round(self.hits / self.lookups, 3) if self.lookups else 0.0,
+                "evictions": self.evictions,
+                "expired": self.expired,
+            }
+
+
+vision_frame_cache = FrameCache(
+    max_distance=config.FRAME_CACHE_MAX_DISTANCE,
+    maxsize=config.FRAME_CACHE_SIZE if config.FRAME_CACHE_ENABLED else 0,
+    ttl_seconds=config.FRAME_CACHE_TTL_SECONDS or None,
+    task_max_distance={"text_recognition": config.FRAME_CACHE_TEXT_MAX_DISTANCE},
+)
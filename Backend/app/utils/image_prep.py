@@ -0,0 +1,118 @@
+"""
+Image preparation before vision-LLM calls.
+
+Phone frames arrive at full camera resolution, which mostly buys upload time
+and vision tokens. Each task gets a profile: the longest side and total pixel
+count are capped (text recognition keeps more detail than captioning), the
+image is rotated upright from its EXIF orientation, then re-encoded without
+metadata as JPEG or WebP at the task's quality.
+"""
+import io
+import math
+import threading
+import time
+from typing import NamedTuple
+
+from ..config import config
+
+
+class ImageProfile(NamedTuple):
+    max_side: int
+    max_pixels: int
+    format: str  # "JPEG" or "WEBP"
+    quality: int
+
+
+IMAGE_PROFILES = {
+    # Small print has to stay legible
+    "text_recognition": ImageProfile(2048, 2048 * 1536, "JPEG", 88),
+    "currency_detection": ImageProfile(1280, 1280 * 960, "JPEG", 80),
+    "image_captioning": ImageProfile(1024, 1024 * 768, "JPEG", 72),
+    "distance_estimation": ImageProfile(1024, 1024 * 768, "JPEG", 75),
+}
+DEFAULT_PROFILE = ImageProfile(1280, 1280 * 960, "JPEG", 80)
+
+MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+
+class PreparedImage(NamedTuple):
+    data: bytes
+    mime: str
+    width: int
+    height: int
+    original_bytes: int
+
+
+class ImagePrepStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks = {}
+
+    def record(self, task: str, bytes_in: int, bytes_out: int, seconds: float):
+        with self._lock:
+            stats = self._tasks.setdefault(task, {"images": 0, "bytes_in": 0, "bytes_out": 0, "seconds": 0.0})
+            stats["images"] += 1
+            stats["bytes_in"] += bytes_in
+            stats["bytes_out"] += bytes_out
+            stats["seconds"] += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                task: {
+                    "images": stats["images"],
+                    "bytes_in": stats["bytes_in"],
+                    "bytes_out": stats["bytes_out"],
+                    "bytes_saved": stats["bytes_in"] - stats["bytes_out"],
+                    "mean_ms": round(stats["seconds"] * 1000 / stats["images"], 2),
+                }
+                for task, stats in self._tasks.items()
+            }
+
+
+image_prep_stats = ImagePrepStats()
+
+
+def profile_for(task: str) -> ImageProfile:
+    profile = IMAGE_PROFILES.get(task, DEFAULT_PROFILE)
+    if config.IMAGE_PREP_FORMAT in MIME_TYPES:
+        profile = profile._replace(format=config.IMAGE_PREP_FORMAT)
+    return profile
+
+
+def prepare_image(image_bytes: bytes, task: str) -> PreparedImage:
+    """Downscale and re-encode an image for `task` (blocking, CPU-bound)"""
+    from PIL import Image, ImageOps
+
+    start = time.perf_counter()
+    profile = profile_for(task)
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        image = ImageOps.exif_transpose(image)  # Keep it upright once EXIF is gone
+        width, height = image.size
+        scale = min(1.0, profile.max_side / max(width, height), math.sqrt(profile.max_pixels / (width * height)))
+        if scale < 1.0:
+            width, height = max(1, round(width * scale)), max(1, round(height * scale))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        # Metadata is only written when passed to save(); drop it from info too
+        image.info.pop("exif", None)
+        buffer = io.BytesIO()
+        image.save(buffer, format=profile.format, quality=profile.quality, optimize=True)
+
+    data = buffer.getvalue()
+    image_prep_stats.record(task, len(image_bytes), len(data), time.perf_counter() - start)
+    return PreparedImage(data, MIME_TYPES[profile.format], width, height, len(image_bytes))
+
+
+def prepare_frame_for_llm(frame, task: str):
+    """(base64, mime) of the frame prepared for `task`; the original as JPEG if it cannot be processed"""
+    if not config.IMAGE_PREP_ENABLED:
+        return frame.base64, "image/jpeg"
+    try:
+        prepared, encoded = frame.prepared(task)
+    except Exception as e:
+        print(f"⚠️  Image preparation failed, sending the original: {e}")
+        return frame.base64, "image/jpeg"
+    return encoded, prepared.mime
@@ -0,0 +1,55 @@
+"""
+Precomputed phrase-embedding index for intent routing.
+
+All label phrases are encoded once into a single L2-normalised matrix, so a
+query costs one transcript encode and one matrix-vector product instead of one
+embedder forward pass per phrase.
+"""
+import numpy as np
+
+
+class IntentIndex:
+    def __init__(self, embedder, feature_phrases):
+        self.embedder = embedder
+        self.labels = []
+        self.offsets = []
+        self.matrix = None
+        self.build(feature_phrases)
+
+    def build(self, feature_phrases):
+        """(Re)encode every phrase of every feature into one embedding matrix"""
+        labels, offsets, phrases = [], [], []
+        for label, label_phrases in feature_phrases.items():
+            if not label_phrases:
+                continue  # Features without phrases can never be matched
+            labels.append(label)
+            offsets.append(len(phrases))
+            phrases.extend(label_phrases)
+
+        matrix = self.embedder.encode(phrases, convert_to_numpy=True, normalize_embeddings=True)
+        self.labels = labels
+        self.offsets = np.asarray(offsets, dtype=np.intp)
+        self.matrix = np.asarray(matrix, dtype=np.float32)
+
+    def scores(self, text):
+        """Cosine similarity of `text` against every phrase, in matrix order"""
+        query = self.embedder.encode(text, convert_to_numpy=True, normalize_embeddings=True)
+        return self.matrix @ np.asarray(query, dtype=np.float32)
+
+    def feature_scores(self, text, reduction="max"):
+        """Per-feature score: best single phrase ("max") or phrase average ("mean")"""
+        scores = self.scores(text)
+        if reduction == "max":
+            return np.maximum.reduceat(scores, self.offsets)
+        if reduction == "mean":
+            counts = np.diff(np.append(self.offsets, len(scores)))
+            return np.add.reduceat(scores, self.offsets) / counts
+        raise ValueError(f"Unsupported reduction: {reduction}")
+
+    def best_match(self, text, reduction="max"):
+        """Return (label, score) of the highest scoring feature"""
+        if not self.labels:
+            return None, -1
+        per_feature = self.feature_scores(text, reduction)
+        best = int(np.argmax(per_feature))  # First maximum wins, like the old loops
+        return self.labels[best], float(per_feature[best])
@@ -0,0 +1,93 @@
+"""
+Aho-Corasick multi-pattern matcher for exact keyword and trigger detection.
+
+All patterns are compiled once into a single automaton, so finding every
+keyword hit in a transcript is one pass over the text however many patterns
+there are. Each pattern's position in the input list is its priority; `first`
+returns the lowest-priority hit, which reproduces the "first keyword in table
+order wins" semantics of a nested `for ... if keyword in text` loop.
+"""
+from typing import NamedTuple
+
+
+class KeywordMatch(NamedTuple):
+    start: int
+    end: int
+    priority: int
+    pattern: str
+    payload: object
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch in "_'"
+
+
+class KeywordAutomaton:
+    def __init__(self, patterns, word_boundary: bool = False):
+        """
+        Args:
+            patterns: Iterable of (pattern, payload) pairs, in priority order.
+            word_boundary: Only report hits that are whole words/phrases by default.
+        """
+        self.word_boundary = word_boundary
+        self.build(patterns)
+
+    def build(self, patterns):
+        """(Re)compile the automaton, e.g. after the label tables changed"""
+        goto, fail, outputs = [{}], [0], [[]]
+        compiled = []
+        for pattern, payload in patterns:
+            pattern = pattern.lower()
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    outputs.append([])
+                node = nxt
+            outputs[node].append(len(compiled))
+            compiled.append((pattern, payload))
+
+        # Breadth-first failure links; each node also reports its suffixes' outputs
+        queue = list(goto[0].values())
+        for node in queue:
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fail[nxt] = goto[state].get(ch, 0)
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+
+        self._goto, self._fail, self._outputs = goto, fail, outputs
+        self.patterns = compiled
+
+    def iter_matches(self, text: str, word_boundary: bool | None = None):
+        """Yield every pattern occurrence in `text` (case-insensitive), in order of end position"""
+        if word_boundary is None:
+            word_boundary = self.word_boundary
+        text = text.lower()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for priority in outputs[node]:
+                pattern, payload = self.patterns[priority]
+                start, end = i + 1 - len(pattern), i + 1
+                if word_boundary and (
+                    (start > 0 and _is_word_char(text[start - 1]))
+                    or (end < len(text) and _is_word_char(text[end]))
+                ):
+                    continue
+                yield KeywordMatch(start, end, priority, pattern, payload)
+
+    def first(self, text: str, word_boundary: bool | None = None):
+        """Highest-priority (earliest listed) pattern found anywhere in `text`, or None"""
+        return min(self.iter_matches(text, word_boundary), key=lambda m: m.priority, default=None)
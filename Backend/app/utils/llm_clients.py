@@ -0,0 +1,301 @@
+"""
+Long-lived LLM clients shared by every pipeline.
+
+Building a ChatOpenAI / ChatGroq / openai.OpenAI per request means a new
+connection pool, and so a new TCP + TLS handshake, on every call. Instead all
+provider SDK clients sit on one pair of keep-alive httpx pools (sync and
+async), and each provider/model/temperature gets a single chat model that is
+reused for the lifetime of the process. Pool sizes and timeouts come from the
+LLM_* settings in config.
+
+Async callers go through `llm_clients.call`, which caps in-flight requests per
+provider with a semaphore and enforces a per-request deadline, so a worker can
+keep many slow LLM calls open without holding a thread for each.
+"""
+import asyncio
+import os
+import threading
+import time
+
+from ..config import config
+
+PROVIDER_API_KEYS = {
+    "openai": "OPENAI_API_KEY",
+    "groq": "GROQ_API_KEY",
+}
+
+
+class ProviderLimit:
+    """Caps concurrent in-flight calls to one provider (event-loop side only)"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+        }
+
+
+class LLMClientRegistry:
+    """One client per provider/model/temperature over shared HTTP connection pools"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._http_client = None
+        self._http_async_client = None
+        self._sdk_clients = {}   # (provider, is_async) -> SDK client
+        self._chat_models = {}   # (provider, model, temperature) -> LangChain chat model
+        self._usage = {}         # client key -> {"created_at", "uses"}
+        self._limits = {}        # provider -> ProviderLimit
+        self.requests = 0
+        self.connections_opened = 0
+
+    # --- Shared HTTP pools ---
+
+    def _pool_settings(self):
+        import httpx
+        limits = httpx.Limits(
+            max_connections=config.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=config.LLM_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        timeout = httpx.Timeout(config.LLM_TIMEOUT_SECONDS, connect=config.LLM_CONNECT_TIMEOUT_SECONDS)
+        return limits, timeout
+
+    def _count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def _count_connection(self, event_name):
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+
+    def _trace(self, event_name, info):
+        self._count_connection(event_name)
+
+    async def _atrace(self, event_name, info):
+        self._count_connection(event_name)
+
+    def _on_request(self, request):
+        self._count_request()
+        request.extensions["trace"] = self._trace
+
+    async def _on_async_request(self, request):
+        self._count_request()
+        request.extensions["trace"] = self._atrace
+
+    def http_client(self):
+        """Process-wide keep-alive httpx.Client"""
+        with self._lock:
+            if self._http_client is None:
+                import httpx
+                limits, timeout = self._pool_settings()
+                self._http_client = httpx.Client(
+                    limits=limits, timeout=timeout, event_hooks={"request": [self._on_request]}
+                )
+            return self._http_client
+
+    def http_async_client(self):
+        """Process-wide keep-alive httpx.AsyncClient"""
+        with self._lock:
+            if self._http_async_client is None:
+                import httpx
+                limits, timeout = self._pool_settings()
+                self._http_async_client = httpx.AsyncClient(
+                    limits=limits, timeout=timeout, event_hooks={"request": [self._on_async_request]}
+                )
+            return self._http_async_client
+
+    # --- Provider clients ---
+
+    def _touch(self, key):
+        with self._lock:
+            usage = self._usage.setdefault(key, {"created_at": time.time(), "uses": 0})
+            usage["uses"] += 1
+
+    def _sdk_client(self, provider: str, is_async: bool):
+        key = (provider, is_async)
+        client = self._sdk_clients.get(key)
+        if client is None:
+            http_client = self.http_async_client() if is_async else self.http_client()
+            _, timeout = self._pool_settings()
+            options = dict(
+                api_key=os.getenv(PROVIDER_API_KEYS[provider]),
+                http_client=http_client,
+                timeout=timeout,
+                max_retries=config.LLM_MAX_RETRIES,
+            )
+            if provider == "openai":
+                import openai
+                client = openai.AsyncOpenAI(**options) if is_async else openai.OpenAI(**options)
+            elif provider == "groq":
+                import groq
+                client = groq.AsyncGroq(**options) if is_async else groq.Groq(**options)
+            else:
+                raise ValueError(f"Unsupported provider: {provider}")
+            with self._lock:
+                client = self._sdk_clients.setdefault(key, client)
+        return client
+
+    def openai_client(self):
+        """Shared openai.OpenAI client for direct chat.completions calls"""
+        self._touch("openai/sdk")
+        return self._sdk_client("openai", is_async=False)
+
+    def chat_model(self, provider: str, model: str, temperature: float = 0.7):
+        """LangChain chat model for provider/model/temperature, created once and reused"""
+        key = (provider, model, temperature)
+        llm = self._chat_models.get(key)
+        if llm is None:
+            sync_client = self._sdk_client(provider, is_async=False).chat.completions
+            async_client = self._sdk_client(provider, is_async=True).chat.completions
+            if provider == "openai":
+                from langchain_community.chat_models import ChatOpenAI
+                llm = ChatOpenAI(model=model, temperature=temperature, client=sync_client, async_client=async_client)
+            elif provider == "groq":
+                from langchain_groq import ChatGroq
+                llm = ChatGroq(
+                    model=model,
+                    temperature=temperature,
+                    groq_api_key=os.getenv(PROVIDER_API_KEYS[provider]),
+                    client=sync_client,
+                    async_client=async_client,
+                )
+            else:
+                raise ValueError(f"Unsupported provider: {provider}")
+            with self._lock:
+                llm = self._chat_models.setdefault(key, llm)
+        self._touch(f"{provider}/{model}@{temperature:g}")
+        return llm
+
+    # --- Async calls with per-provider concurrency limits ---
+
+    def provider_limit(self, provider: str) -> ProviderLimit:
+        limit = self._limits.get(provider)
+        if limit is None:
+            with self._lock:
+                limit = self._limits.setdefault(provider, ProviderLimit(config.LLM_CONCURRENCY.get(provider, 8)))
+        return limit
+
+    async def call(self, provider: str, fn, *args, deadline_seconds: float | None = None, **kwargs):
+        """Await fn(*args, **kwargs) in one of the provider's concurrency slots.
+
+        `deadline_seconds` (default LLM_REQUEST_DEADLINE_SECONDS, 0 = none)
+        bounds the whole request including the wait for a slot; TimeoutError
+        is raised once it passes.
+        """
+        limit = self.provider_limit(provider)
+        if deadline_seconds is None:
+            deadline_seconds = config.LLM_REQUEST_DEADLINE_SECONDS
+        limit.waiting += 1
+        waiting = True
+        try:
+            async with asyncio.timeout(deadline_seconds or None):
+                async with limit.semaphore:
+                    limit.waiting -= 1
+                    waiting = False
+                    limit.in_flight += 1
+                    try:
+                        result = await fn(*args, **kwargs)
+                    finally:
+                        limit.in_flight -= 1
+        except TimeoutError:
+            limit.timeouts += 1
+            raise
+        except Exception:
+            limit.failed += 1
+            raise
+        finally:
+            if waiting:
+                limit.waiting -= 1
+        limit.completed += 1
+        return result
+
+    async def stream(self, provider: str, iterator, deadline_seconds: float | None = None):
+        """Relay a provider's async stream while holding one of its concurrency slots.
+
+        The deadline covers the wait for a slot and the whole stream; it is
+        checked around each chunk, never across a yield to the consumer.
+        """
+        limit = self.provider_limit(provider)
+        if deadline_seconds is None:
+            deadline_seconds = config.LLM_REQUEST_DEADLINE_SECONDS
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + deadline_seconds if deadline_seconds else None
+
+        limit.waiting += 1
+        try:
+            async with asyncio.timeout_at(deadline):
+                await limit.semaphore.acquire()
+        except TimeoutError:
+            limit.timeouts += 1
+            raise
+        finally:
+            limit.waiting -= 1
+
+        limit.in_flight += 1
+        try:
+            while True:
+                async with asyncio.timeout_at(deadline):
+                    try:
+                        item = await anext(iterator)
+                    except StopAsyncIteration:
+                        break
+                yield item
+        except TimeoutError:
+            limit.timeouts += 1
+            raise
+        except Exception:
+            limit.failed += 1
+            raise
+        else:
+            limit.completed += 1
+        finally:
+            limit.in_flight -= 1
+            limit.semaphore.release()
+            if hasattr(iterator, "aclose"):
+                await iterator.aclose()
+
+    def stats(self) -> dict:
+        with self._lock:
+            reused = max(0, self.requests - self.connections_opened)
+            return {
+                "http": {
+                    "requests": self.requests,
+                    "connections_opened": self.connections_opened,
+                    "reused_connections": reused,
+                    "reuse_rate": round(reused / self.requests, 3) if self.requests else 0.0,
+                    "max_connections": config.LLM_MAX_CONNECTIONS,
+                    "max_keepalive_connections": config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                },
+                "clients": {key: dict(usage) for key, usage in self._usage.items()},
+                "providers": {provider: limit.stats() for provider, limit in self._limits.items()},
+            }
+
+    async def aclose(self):
+        """Close the shared pools (app shutdown)"""
+        with self._lock:
+            http_client, self._http_client = self._http_client, None
+            http_async_client, self._http_async_client = self._http_async_client, None
+            self._sdk_clients.clear()
+            self._chat_models.clear()
+        if http_client is not None:
+            http_client.close()
+        if http_async_client is not None:
+            await http_async_client.aclose()
+
+
+llm_clients = LLMClientRegistry()
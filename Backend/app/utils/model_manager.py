@@ -0,0 +1,213 @@
+"""
+Process-wide registry of lazily loaded, shared models.
+
+Each model is a ManagedModel: the first caller loads it behind a lock;
+concurrent callers block on that same lock instead of polling and all receive
+the single loaded instance. Replacing a model is an explicit hot swap: the new
+weights are loaded on the side while requests keep using the old ones, then
+swapped in atomically.
+
+The ModelRegistry hands these out by name, tracks how much memory each one
+holds and, under a configured budget, unloads models that have been idle.
+"""
+import os
+import threading
+import time
+
+from ..config import config
+
+
+def model_memory_bytes(model):
+    """Best-effort size of a torch model's parameters and buffers, in bytes"""
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+    except Exception:
+        return None
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+def process_rss_bytes():
+    """Resident set size of this process (Linux only, None elsewhere)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+class ManagedModel:
+    def __init__(self, name: str, loader, evictable: bool = True, on_load=None):
+        self.name = name
+        self.evictable = evictable
+        self._loader = loader
+        self._on_load = on_load
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._swap_lock = threading.Lock()
+        self.version = 0
+        self.loaded_at = None
+        self.last_used = None
+        self.load_seconds = None
+        self.memory_bytes = None
+        self.last_error = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def _load(self, loader):
+        print(f"🔄 Loading {self.name} model...")
+        rss_before = process_rss_bytes()
+        start = time.perf_counter()
+        try:
+            model = loader()
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"⚠️  Failed to load {self.name} model: {e}")
+            raise
+        load_seconds = time.perf_counter() - start
+        print(f"✅ {self.name} model loaded in {load_seconds:.2f}s")
+
+        memory_bytes = model_memory_bytes(model)
+        if memory_bytes is None and rss_before is not None:
+            # Not a torch module: fall back to how much the process grew
+            memory_bytes = max(0, (process_rss_bytes() or rss_before) - rss_before)
+        return model, load_seconds, memory_bytes
+
+    def _install(self, model, load_seconds, memory_bytes):
+        self._model = model
+        self.version += 1
+        self.loaded_at = time.time()
+        self.load_seconds = load_seconds
+        self.memory_bytes = memory_bytes
+        self.last_error = None
+
+    def get(self):
+        """Return the model, loading it once if nobody has yet"""
+        self.last_used = time.monotonic()
+        model = self._model
+        if model is not None:
+            return model
+        with self._load_lock:
+            loaded = self._model is None
+            if loaded:
+                self._install(*self._load(self._loader))
+            model = self._model
+        if loaded and self._on_load is not None:
+            self._on_load(self.name)
+        return model
+
+    def swap(self, loader=None):
+        """Load a replacement (optionally from a new loader) and swap it in.
+
+        Requests keep using the current model until the new one is ready, so a
+        reload never adds load time to a user's request.
+        """
+        with self._swap_lock:
+            loader = loader or self._loader
+            loaded = self._load(loader)
+            with self._load_lock:
+                self._loader = loader
+                self._install(*loaded)
+            return loaded[0]
+
+    def unload(self):
+        """Drop the model; in-flight callers keep their reference until done"""
+        with self._load_lock:
+            self._model = None
+            self.memory_bytes = None
+
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_used if self.last_used is not None else float("inf")
+
+    def stats(self) -> dict:
+        loaded = self._model is not None
+        return {
+            "status": "loaded" if loaded else "not loaded",
+            "evictable": self.evictable,
+            "version": self.version,
+            "age_seconds": round(time.time() - self.loaded_at, 1) if loaded else 0,
+            "idle_seconds": round(self.idle_seconds(), 1) if self.last_used is not None else None,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "memory_mb": round(self.memory_bytes / 2**20, 1) if self.memory_bytes else None,
+            "last_error": self.last_error,
+        }
+
+
+class ModelHandle:
+    """Stand-in that resolves the named model from the registry on every use.
+
+    Lets modules keep a module-level `embedder`-style reference without
+    loading the model at import time or pinning it against eviction.
+    """
+
+    def __init__(self, registry, name: str):
+        self._registry = registry
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._registry.get(self._name), attr)
+
+
+class ModelRegistry:
+    def __init__(self, memory_budget_bytes: int = 0, idle_seconds: float = 600):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.idle_seconds = idle_seconds
+        self._models = {}
+        self._handles = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def register(self, name: str, loader, evictable: bool = True) -> ManagedModel:
+        """Register a loader under `name`; the first registration wins"""
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = ManagedModel(
+                    name, loader, evictable, on_load=lambda loaded: self.enforce_budget(keep=loaded)
+                )
+            return self._models[name]
+
+    def entry(self, name: str) -> ManagedModel:
+        return self._models[name]
+
+    def get(self, name: str):
+        return self._models[name].get()
+
+    def handle(self, name: str) -> ModelHandle:
+        with self._lock:
+            if name not in self._handles:
+                self._handles[name] = ModelHandle(self, name)
+            return self._handles[name]
+
+    def total_memory_bytes(self) -> int:
+        return sum(m.memory_bytes or 0 for m in self._models.values() if m.is_loaded)
+
+    def enforce_budget(self, keep: str | None = None):
+        """Unload least recently used idle models until under the memory budget"""
+        if not self.memory_budget_bytes:
+            return
+        candidates = sorted(
+            (m for m in self._models.values()
+             if m.is_loaded and m.evictable and m.name != keep and m.idle_seconds() >= self.idle_seconds),
+            key=lambda m: m.last_used or 0,
+        )
+        for model in candidates:
+            if self.total_memory_bytes() <= self.memory_budget_bytes:
+                break
+            print(f"♻️  Unloading idle {model.name} model to stay within the memory budget")
+            model.unload()
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "memory_budget_mb": round(self.memory_budget_bytes / 2**20, 1) if self.memory_budget_bytes else None,
+            "total_memory_mb": round(self.total_memory_bytes() / 2**20, 1),
+            "evictions": self.evictions,
+            "models": {name: model.stats() for name, model in self._models.items()},
+        }
+
+
+model_registry = ModelRegistry(
+    memory_budget_bytes=config.MODEL_MEMORY_BUDGET_MB * 2**20,
+    idle_seconds=config.MODEL_IDLE_SECONDS,
+)
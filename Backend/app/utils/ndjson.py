@@ -0,0 +1,23 @@
+"""
+Newline-delimited JSON streaming responses.
+
+One JSON object per line, flushed as soon as it is produced, so a client can
+act on the first record (e.g. read the first headline aloud) while the rest
+are still being prepared. Streams end with a status record.
+"""
+import json
+
+from fastapi.responses import StreamingResponse
+
+
+def ndjson_line(record: dict) -> str:
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def ndjson_response(lines) -> StreamingResponse:
+    return StreamingResponse(
+        lines,
+        media_type="application/x-ndjson",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
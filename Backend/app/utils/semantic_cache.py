@@ -0,0 +1,192 @@
+"""
+Semantic response cache: answers keyed by the question's sentence embedding.
+
+A lookup embeds the question with the shared intent-routing embedder and
+takes the nearest cached question; at or above the similarity threshold its
+answer is reused, so rephrased repeats ("what's the weather like" / "what is
+the weather like") skip the LLM. Exact repeats are answered without embedding
+at all. Entries expire after a TTL and the least recently used are evicted
+beyond `maxsize`. With a db_path, entries are also kept in SQLite and
+reloaded on startup.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+
+from ..config import config
+from .embedders import embedder
+from .sqlite_cache import SqliteCache
+
+
+class CacheLookup(NamedTuple):
+    answer: str | None       # None on a miss
+    similarity: float
+    vector: np.ndarray | None  # Question embedding, reused by store() after a miss
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(question.lower().split())
+
+
+class SemanticCache:
+    def __init__(
+        self,
+        embedder,
+        threshold: float,
+        maxsize: int,
+        ttl_seconds: float | None = None,
+        db_path: str | None = None,
+    ):
+        self.embedder = embedder
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.enabled = maxsize > 0
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (question, answer, slot), LRU order
+        self._vectors = None           # (maxsize, dim) matrix, one row per slot
+        self._stored_at = np.zeros(maxsize)
+        self._valid = np.zeros(maxsize, dtype=bool)
+        self._slot_keys = [None] * maxsize
+        self._free = list(range(maxsize - 1, -1, -1))
+        self.lookups = 0
+        self.hits = 0
+        self.exact_hits = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expired = 0
+
+        self._db = SqliteCache(db_path, table="semantic_cache") if db_path else None
+        if self._db is not None:
+            self._db.purge_expired()
+            for key, value, stored_at in reversed(self._db.items(limit=maxsize)):
+                self._insert(key, value["question"], value["answer"], np.asarray(value["vector"], dtype=np.float32), stored_at)
+
+    @staticmethod
+    def key_for(question: str) -> str:
+        return hashlib.sha1(normalize_question(question).encode("utf-8")).hexdigest()
+
+    def _encode(self, question: str) -> np.ndarray:
+        vector = self.embedder.encode(normalize_question(question), convert_to_numpy=True, normalize_embeddings=True)
+        return np.asarray(vector, dtype=np.float32)
+
+    def _is_expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - stored_at > self.ttl_seconds
+
+    def _remove(self, key: str):
+        """Drop an entry (lock held); returns the freed slot"""
+        _, _, slot = self._entries.pop(key)
+        self._valid[slot] = False
+        self._slot_keys[slot] = None
+        self._free.append(slot)
+        return slot
+
+    def _insert(self, key, question, answer, vector, stored_at):
+        """Place an entry (lock held); returns the key it evicted, if any"""
+        evicted = None
+        if key in self._entries:
+            self._remove(key)
+        elif not self._free:
+            evicted, _ = next(iter(self._entries.items()))
+            self._remove(evicted)
+            self.evictions += 1
+        slot = self._free.pop()
+        if self._vectors is None:
+            self._vectors = np.zeros((self.maxsize, vector.shape[0]), dtype=np.float32)
+        self._vectors[slot] = vector
+        self._stored_at[slot] = stored_at
+        self._valid[slot] = True
+        self._slot_keys[slot] = key
+        self._entries[key] = (question, answer, slot)
+        return evicted
+
+    def lookup(self, question: str) -> CacheLookup:
+        """Best cached answer for `question` if it is similar enough (blocking: may run the embedder)"""
+        key = self.key_for(question)
+        now = time.time()
+        with self._lock:
+            self.lookups += 1
+            entry = self._entries.get(key)
+            if entry is not None and not self._is_expired(self._stored_at[entry[2]], now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.exact_hits += 1
+                return CacheLookup(entry[1], 1.0, None)
+
+        vector = self._encode(question)
+        with self._lock:
+            if self._vectors is None or not self._valid.any():
+                return CacheLookup(None, 0.0, vector)
+
+            live = self._valid.copy()
+            if self.ttl_seconds is not None:
+                stale = live & (now - self._stored_at > self.ttl_seconds)
+                for slot in np.flatnonzero(stale):
+                    self._remove(self._slot_keys[slot])
+                    self.expired += 1
+                live &= ~stale
+                if not live.any():
+                    return CacheLookup(None, 0.0, vector)
+
+            similarities = np.where(live, self._vectors @ vector, -np.inf)
+            slot = int(np.argmax(similarities))
+            similarity = float(similarities[slot])
+            if similarity < self.threshold:
+                return CacheLookup(None, similarity, vector)
+
+            key = self._slot_keys[slot]
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return CacheLookup(self._entries[key][1], similarity, vector)
+
+    def store(self, question: str, answer: str, vector: np.ndarray | None = None):
+        """Cache an answer; pass the vector from a missed lookup to skip re-embedding"""
+        if self.maxsize <= 0 or not answer:
+            return
+        if vector is None:
+            vector = self._encode(question)
+        key = self.key_for(question)
+        stored_at = time.time()
+        with self._lock:
+            evicted = self._insert(key, question, answer, vector, stored_at)
+            self.stores += 1
+
+        if self._db is not None:
+            if evicted is not None:
+                self._db.delete(evicted)
+            self._db.set(
+                key,
+                {"question": question, "answer": answer, "vector": vector.tolist()},
+                ttl_seconds=self.ttl_seconds,
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "threshold": self.threshold,
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "exact_hits": self.exact_hits,
+                "misses": self.lookups - self.hits,
+                "hit_rate": round(self.hits / self.lookups, 3) if self.lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "expired": self.expired,
+                "persistent": self._db is not None,
+            }
+
+
+# Answers to general_question_answering (text-only questions)
+qa_response_cache = SemanticCache(
+    embedder,
+    threshold=config.QA_CACHE_THRESHOLD,
+    maxsize=config.QA_CACHE_SIZE if config.QA_CACHE_ENABLED else 0,
+    ttl_seconds=config.QA_CACHE_TTL_SECONDS or None,
+    db_path=config.QA_CACHE_DB_PATH or None,
+)
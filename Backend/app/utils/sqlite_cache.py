@@ -0,0 +1,95 @@
+"""
+Small persistent key -> JSON value store on SQLite, with per-entry expiry.
+
+Used as the optional on-disk backing of in-process caches so their contents
+survive restarts. One connection per store, guarded by a lock, so it can be
+used from any worker thread. With `max_entries`, reads record when an entry
+was last used and writes evict the least recently used beyond the bound.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class SqliteCache:
+    def __init__(self, path: str, table: str = "cache", max_entries: int | None = None):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " expires_at REAL,"
+                " used_at REAL)"
+            )
+            columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            if "used_at" not in columns:  # Tables created before LRU bounding
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN used_at REAL")
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return default
+        if self.max_entries:
+            with self._lock, self._conn:
+                self._conn.execute(f"UPDATE {self.table} SET used_at = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value, ttl_seconds: float | None = None):
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at, expires_at, used_at) VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(value), now, expires_at, now),
+            )
+            if self.max_entries:
+                cursor = self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f" SELECT key FROM {self.table} ORDER BY COALESCE(used_at, stored_at) DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self.evictions += cursor.rowcount
+
+    def delete(self, key: str):
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def items(self, limit: int | None = None):
+        """Unexpired (key, value, stored_at), newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, value, stored_at FROM {self.table}"
+                " WHERE expires_at IS NULL OR expires_at >= ? ORDER BY stored_at DESC LIMIT ?",
+                (time.time(), -1 if limit is None else limit),
+            ).fetchall()
+        return [(key, json.loads(value), stored_at) for key, value, stored_at in rows]
+
+    def purge_expired(self) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+            )
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
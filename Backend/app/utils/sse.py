@@ -0,0 +1,74 @@
+"""
+Server-Sent Events for streamed LLM answers.
+
+Each answer is sent as
+    event: token     {"text": ...}                 every chunk from the model
+    event: sentence  {"index": n, "text": ...}     as soon as a sentence ends
+    event: done      {"text": <full answer>}
+or `event: error {"detail": ...}` if generation fails part-way. Sentence events
+let the client start text-to-speech on the first sentence instead of waiting
+for the whole answer.
+"""
+import json
+import re
+
+from fastapi.responses import StreamingResponse
+
+# Same boundary rule as formatter.segment_text_by_sentence
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class SentenceSplitter:
+    """Cut streamed text into sentences incrementally, as each one completes"""
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        """Add a chunk; return the sentences it completed"""
+        self._buffer += text
+        parts = SENTENCE_BOUNDARY.split(self._buffer)
+        self._buffer = parts.pop()
+        return [part.strip() for part in parts if part.strip()]
+
+    def flush(self) -> str | None:
+        """Whatever is left once the stream ends"""
+        tail, self._buffer = self._buffer.strip(), ""
+        return tail or None
+
+
+async def llm_sse_events(tokens):
+    """Turn an async iterator of text chunks into SSE token/sentence/done events"""
+    splitter = SentenceSplitter()
+    answer = []
+    index = 0
+    try:
+        async for token in tokens:
+            answer.append(token)
+            yield sse_event("token", {"text": token})
+            for sentence in splitter.feed(token):
+                yield sse_event("sentence", {"index": index, "text": sentence})
+                index += 1
+        tail = splitter.flush()
+        if tail:
+            yield sse_event("sentence", {"index": index, "text": tail})
+        yield sse_event("done", {"text": "".join(answer).strip()})
+    except TimeoutError:
+        yield sse_event("error", {"detail": "The request timed out"})
+    except Exception as e:
+        # The exception stays in the server log; clients get a generic detail
+        print(f"❌ Streaming error: {type(e).__name__}: {e}")
+        yield sse_event("error", {"detail": "Failed to generate a response"})
+
+
+def sse_response(events) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
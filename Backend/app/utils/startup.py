@@ -0,0 +1,91 @@
+"""
+Startup-time report and readiness tracking.
+
+Records how long each import and model load takes, so cold-start cost can be
+broken down by module, and whether the background warm-up has finished.
+The app only counts as ready once every required step (a model the request
+path cannot work without) has succeeded.
+"""
+import importlib
+import threading
+import time
+
+# Roughly the moment the interpreter started importing the app
+PROCESS_STARTED = time.perf_counter()
+
+
+class StartupReport:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps = {}
+        self.ready = False
+        self.ready_after_seconds = None
+        self._task = None
+
+    def record(self, name: str, seconds: float, status: str = "ok", error: str | None = None, required: bool = False):
+        with self._lock:
+            self.steps[name] = {
+                "status": status,
+                "seconds": round(seconds, 3),
+                "required": required,
+                **({"error": error} if error else {}),
+            }
+
+    def step(self, name: str, fn, *args, required: bool = False, **kwargs):
+        """Run one warm-up step, recording its duration; failures are reported, not raised.
+
+        A failed `required` step keeps the app from being marked ready.
+        """
+        with self._lock:
+            self.steps[name] = {"status": "running", "required": required}
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            print(f"⚠️  Startup step '{name}' failed: {e}")
+            self.record(name, time.perf_counter() - start, "failed", str(e), required)
+            return None
+        self.record(name, time.perf_counter() - start, required=required)
+        return result
+
+    def failed_steps(self) -> list[str]:
+        """Required steps that did not succeed"""
+        with self._lock:
+            return [name for name, step in self.steps.items() if step.get("required") and step["status"] != "ok"]
+
+    def import_module(self, module_name: str):
+        return self.step(f"import {module_name}", importlib.import_module, module_name)
+
+    def mark_ready(self):
+        self.ready = True
+        self.ready_after_seconds = round(time.perf_counter() - PROCESS_STARTED, 3)
+        print(f"✅ Startup complete in {self.ready_after_seconds:.2f}s")
+
+    def track(self, task):
+        """Mark the app ready once the background warm-up task finishes, if every required step succeeded"""
+        self._task = task
+        task.add_done_callback(self._warm_up_done)
+
+    def _warm_up_done(self, task):
+        if task.cancelled() or task.exception() is not None:
+            print(f"❌ Startup warm-up did not finish: {task.exception() if not task.cancelled() else 'cancelled'}")
+            return
+        failed = self.failed_steps()
+        if failed:
+            print(f"❌ Not ready, required startup steps failed: {', '.join(failed)}")
+            return
+        self.mark_ready()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            steps = dict(self.steps)
+        return {
+            "ready": self.ready,
+            "ready_after_seconds": self.ready_after_seconds,
+            "failed_steps": self.failed_steps(),
+            "uptime_seconds": round(time.perf_counter() - PROCESS_STARTED, 3),
+            "steps": steps,
+        }
+
+
+startup_report = StartupReport()
@@ -0,0 +1,144 @@
+"""
+Energy-based voice activity helpers for 16 kHz mono float32 audio.
+"""
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def frame_rms(audio: np.ndarray, frame_ms: int = 20, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Root-mean-square energy of consecutive non-overlapping frames"""
+    frame_len = max(1, sample_rate * frame_ms // 1000)
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+    return np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+
+
+def speech_threshold(energies: np.ndarray, threshold_db: float = -35.0, floor: float = 1e-3) -> float:
+    """Energy above which a frame counts as speech, relative to the loudest frame"""
+    if energies.size == 0:
+        return floor
+    return max(floor, float(energies.max()) * 10 ** (threshold_db / 20))
+
+
+def trim_silence(
+    audio: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    frame_ms: int = 20,
+    threshold_db: float = -35.0,
+    padding_ms: int = 200,
+) -> np.ndarray:
+    """Drop leading and trailing silence, keeping `padding_ms` around the speech.
+
+    Returns an empty array when no frame rises above the speech threshold.
+    """
+    energies = frame_rms(audio, frame_ms, sample_rate)
+    voiced = np.flatnonzero(energies > speech_threshold(energies, threshold_db))
+    if voiced.size == 0:
+        return audio[:0]
+
+    frame_len = sample_rate * frame_ms // 1000
+    padding = sample_rate * padding_ms // 1000
+    start = max(0, voiced[0] * frame_len - padding)
+    end = min(len(audio), (voiced[-1] + 1) * frame_len + padding)
+    return audio[start:end]
+
+
+class StreamingEndpointer:
+    """
+    Incremental speech segmentation for audio arriving in arbitrary chunks.
+
+    Frames louder than an adaptive noise floor count as speech. An utterance
+    starts after `min_speech_ms` of consecutive speech (keeping `pre_roll_ms`
+    of audio before it) and ends after `end_silence_ms` of silence or once it
+    reaches `max_utterance_ms`.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        frame_ms: int = 20,
+        min_speech_ms: int = 60,
+        end_silence_ms: int = 600,
+        max_utterance_ms: int = 15000,
+        pre_roll_ms: int = 300,
+        energy_floor: float = 0.01,
+        noise_ratio: float = 3.0,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_len = sample_rate * frame_ms // 1000
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.end_silence_frames = max(1, end_silence_ms // frame_ms)
+        self.max_utterance_frames = max(1, max_utterance_ms // frame_ms)
+        self.pre_roll_frames = max(0, pre_roll_ms // frame_ms)
+        self.energy_floor = energy_floor
+        self.noise_ratio = noise_ratio
+        self.reset()
+
+    def reset(self):
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._pre_roll = []
+        self._utterance = []
+        self._speech_run = 0
+        self._silence_run = 0
+        self._noise = None
+        self.in_speech = False
+
+    @property
+    def speech_seconds(self) -> float:
+        return len(self._utterance) * self.frame_len / self.sample_rate
+
+    def speech_audio(self) -> np.ndarray:
+        """Audio of the utterance in progress (empty when not in speech)"""
+        if not self._utterance:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(self._utterance)
+
+    def _finish(self) -> np.ndarray:
+        audio = self.speech_audio()
+        self._utterance = []
+        self._speech_run = 0
+        self._silence_run = 0
+        self.in_speech = False
+        return audio
+
+    def flush(self):
+        """Force the end of the current utterance; returns its audio or None"""
+        return self._finish() if self.in_speech else None
+
+    def feed(self, samples: np.ndarray) -> list:
+        """Consume float32 samples; returns ("start", None) / ("end", audio) events"""
+        events = []
+        audio = np.concatenate([self._pending, samples.astype(np.float32, copy=False)])
+        n_frames = len(audio) // self.frame_len
+        self._pending = audio[n_frames * self.frame_len:]
+
+        for frame in audio[:n_frames * self.frame_len].reshape(n_frames, self.frame_len):
+            energy = float(np.sqrt(np.mean(np.square(frame))))
+            threshold = max(self.energy_floor, (self._noise or 0.0) * self.noise_ratio)
+            voiced = energy > threshold
+
+            if not self.in_speech:
+                self._pre_roll.append(frame)
+                del self._pre_roll[:-(self.pre_roll_frames + self.min_speech_frames)]
+                if voiced:
+                    self._speech_run += 1
+                else:
+                    self._speech_run = 0
+                    self._noise = energy if self._noise is None else 0.95 * self._noise + 0.05 * energy
+                if self._speech_run >= self.min_speech_frames:
+                    self.in_speech = True
+                    self._utterance = self._pre_roll
+                    self._pre_roll = []
+                    self._silence_run = 0
+                    events.append(("start", None))
+                continue
+
+            self._utterance.append(frame)
+            self._silence_run = 0 if voiced else self._silence_run + 1
+            if self._silence_run >= self.end_silence_frames or len(self._utterance) >= self.max_utterance_frames:
+                events.append(("end", self._finish()))
+
+        return events
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Measure cold start: time from launching uvicorn to the first healthy response
+
+Usage:
+    python benchmark_cold_start.py [--runs 3] [--port 8765]
+
+Each run starts a fresh `uvicorn app.main:app` process and polls it, reporting
+  - time to the first 200 from /health (the app is serving requests)
+  - time until /ready returns 200 (background warm-up finished)
+followed by the per-module import / model-load breakdown from /health.
+
+For a finer import-level profile of the app module itself, run:
+    python -X importtime -c "import app.main" 2> importtime.log
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+import requests
+
+
+def wait_for(url, started, timeout):
+    while time.perf_counter() - started < timeout:
+        try:
+            response = requests.get(url, timeout=1)
+            if response.status_code == 200:
+                return time.perf_counter() - started, response.json()
+        except requests.RequestException:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"{url} not healthy after {timeout}s")
+
+
+def measure(port, timeout):
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        healthy_after, _ = wait_for(f"http://127.0.0.1:{port}/health", started, timeout)
+        ready_after, _ = wait_for(f"http://127.0.0.1:{port}/ready", started, timeout)
+        report = requests.get(f"http://127.0.0.1:{port}/health", timeout=5).json()["startup"]
+        return healthy_after, ready_after, report
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    healthy, ready, report = [], [], None
+    for run in range(1, args.runs + 1):
+        healthy_after, ready_after, report = measure(args.port, args.timeout)
+        healthy.append(healthy_after)
+        ready.append(ready_after)
+        print(f"Run {run}: first healthy response {healthy_after:.2f}s, ready {ready_after:.2f}s")
+
+    print("-" * 60)
+    print(f"Time to first healthy response: median {statistics.median(healthy):.2f}s")
+    print(f"Time to ready:                  median {statistics.median(ready):.2f}s")
+    print("\nStartup breakdown (last run):")
+    for name, step in sorted(report["steps"].items(), key=lambda item: -item[1].get("seconds", 0)):
+        print(f"  {step.get('seconds', 0):8.3f}s  {step['status']:<7} {name}")
+
+
+if __name__ == "__main__":
+    main()
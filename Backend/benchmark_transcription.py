@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Compare long-form Whisper transcription with the short-utterance command path
+
+Usage:
+    python benchmark_transcription.py path/to/command_clips [--repeats 3]
+
+Every audio file in the directory is transcribed with transcribe_audio
+(model.transcribe) and with transcribe_command (trimmed, greedy, token-capped)
+and the per-clip latencies of both modes are summarised.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from app.utils.deepgram import transcribe_audio, transcribe_command, whisper_model
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.webm', '.m4a', '.mp4', '.mpeg', '.mpga', '.ogg', '.flac')
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def time_mode(transcribe, clips, repeats):
+    latencies, transcripts = [], {}
+    for clip in clips:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = transcribe(str(clip))
+            latencies.append(time.perf_counter() - start)
+        transcripts[clip.name] = result.get("transcript", result.get("error"))
+    return latencies, transcripts
+
+
+def summarize(name, latencies):
+    print(
+        f"{name:<10} mean {statistics.mean(latencies) * 1000:8.1f} ms"
+        f" | p50 {percentile(latencies, 50) * 1000:8.1f} ms"
+        f" | p95 {percentile(latencies, 95) * 1000:8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clips_dir", type=Path, help="Directory of recorded command clips")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per clip and mode")
+    args = parser.parse_args()
+
+    clips = sorted(p for p in args.clips_dir.iterdir() if p.suffix.lower() in AUDIO_EXTENSIONS)
+    if not clips:
+        print(f"❌ No audio clips found in {args.clips_dir}")
+        sys.exit(1)
+
+    whisper_model.get()
+    # Warm up both paths so the first timed clip doesn't pay for lazy init
+    transcribe_audio(str(clips[0]))
+    transcribe_command(str(clips[0]))
+
+    long_form, long_text = time_mode(transcribe_audio, clips, args.repeats)
+    command, command_text = time_mode(transcribe_command, clips, args.repeats)
+
+    print(f"\n📊 {len(clips)} clips x {args.repeats} runs")
+    print("-" * 60)
+    summarize("long-form", long_form)
+    summarize("command", command)
+    print(f"Speedup (mean): {statistics.mean(long_form) / statistics.mean(command):.2f}x\n")
+
+    for clip in clips:
+        print(f"{clip.name}:\n  long-form: {long_text[clip.name]}\n  command:   {command_text[clip.name]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Check that the ONNX int8 embedder routes commands exactly like the PyTorch one
+
+Usage:
+    python check_embedder_routing.py
+
+Scores a labeled set of spoken commands against the intent index built with
+each backend, for both the voice-command fallback (best phrase per label) and
+semantic query routing (mean over a label's phrases). Exits non-zero if any
+routing decision differs between the backends.
+"""
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from app.utils.audio import FEATURE_LABELS
+from app.utils.embedders import load_onnx_embedder, load_sentence_transformer
+from app.utils.intent_index import IntentIndex
+
+# Commands phrased without the label names, so the embedding has to do the work
+LABELED_COMMANDS = [
+    ("what is going on in the world today", "News"),
+    ("any updates on the election", "News"),
+    ("can you fill me in on tech stories", "News"),
+    ("i would like to have a word with you", "Chatbot"),
+    ("who wrote romeo and juliet", "Chatbot"),
+    ("how tall is mount everest", "Chatbot"),
+    ("read me this letter", "Text"),
+    ("what does this sign say", "Text"),
+    ("put on some tunes", "Music"),
+    ("which song is this", "Music"),
+    ("resume", "Play"),
+    ("go ahead and run it", "Play"),
+    ("quit", "Stop"),
+    ("be quiet", "Stop"),
+    ("what is in front of me", "Detect"),
+    ("is there anything around me", "Detect"),
+    ("i am lost", "Help"),
+    ("could you give me a hand", "Help"),
+    ("shoot a pic", "Capture"),
+    ("grab a shot of this", "Capture"),
+]
+
+
+def route_all(index, reduction):
+    decisions, latencies = [], []
+    for text, _ in LABELED_COMMANDS:
+        start = time.perf_counter()
+        label, score = index.best_match(text, reduction=reduction)
+        latencies.append(time.perf_counter() - start)
+        decisions.append((label, score))
+    return decisions, latencies
+
+
+def main():
+    backends = {"torch": load_sentence_transformer(), "onnx": load_onnx_embedder()}
+    indexes = {name: IntentIndex(embedder, FEATURE_LABELS) for name, embedder in backends.items()}
+
+    texts = [text for text, _ in LABELED_COMMANDS]
+    torch_vecs = backends["torch"].encode(texts, normalize_embeddings=True)
+    onnx_vecs = backends["onnx"].encode(texts, normalize_embeddings=True)
+    cosine = np.sum(torch_vecs * onnx_vecs, axis=1)
+    print(f"Embedding agreement: mean cosine {cosine.mean():.4f}, min {cosine.min():.4f}\n")
+
+    mismatches = 0
+    for reduction in ("max", "mean"):
+        results = {name: route_all(index, reduction) for name, index in indexes.items()}
+        print(f"[{reduction}] routing")
+        for name, (decisions, latencies) in results.items():
+            correct = sum(label == expected for (label, _), (_, expected) in zip(decisions, LABELED_COMMANDS))
+            print(
+                f"  {name:<6} accuracy {correct}/{len(LABELED_COMMANDS)}"
+                f" | median query {statistics.median(latencies) * 1000:.2f} ms"
+            )
+        for (text, expected), (t_label, t_score), (o_label, o_score) in zip(
+            LABELED_COMMANDS, results["torch"][0], results["onnx"][0]
+        ):
+            if t_label != o_label:
+                mismatches += 1
+                print(f"  ❌ '{text}' (expected {expected}): torch={t_label} ({t_score:.3f}) onnx={o_label} ({o_score:.3f})")
+        print()
+
+    if mismatches:
+        print(f"❌ {mismatches} routing decision(s) differ between backends")
+        sys.exit(1)
+    print("✅ Routing decisions are identical for both backends")
+
+
+if __name__ == "__main__":
+    main()
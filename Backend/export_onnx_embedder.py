@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Export all-MiniLM-L6-v2 to ONNX and quantize it to int8 for EMBEDDER_BACKEND=onnx
+
+Usage:
+    python export_onnx_embedder.py [--output models/minilm-onnx-int8]
+
+Writes model_int8.onnx (dynamically int8-quantized weights) and the tokenizer
+files next to it. Afterwards run check_embedder_routing.py to confirm routing
+decisions match the PyTorch embedder before switching the backend.
+"""
+import argparse
+import os
+from pathlib import Path
+
+import torch
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from transformers import AutoModel, AutoTokenizer
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def export(output_dir: Path, opset: int):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fp32_path = output_dir / "model_fp32.onnx"
+    int8_path = output_dir / "model_int8.onnx"
+
+    print(f"📥 Loading {MODEL_NAME}...")
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    model = AutoModel.from_pretrained(MODEL_NAME).eval()
+
+    sample = tokenizer(["switch to news", "take a picture"], padding=True, return_tensors="pt")
+    inputs = (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"])
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in ("input_ids", "attention_mask", "token_type_ids", "last_hidden_state")}
+
+    print("🔄 Exporting to ONNX...")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            inputs,
+            str(fp32_path),
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+
+    print("🔄 Quantizing weights to int8...")
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    os.remove(fp32_path)
+    tokenizer.save_pretrained(str(output_dir))
+
+    print(f"✅ Saved {int8_path} ({int8_path.stat().st_size / 2**20:.1f} MB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, default=Path(__file__).parent / "models" / "minilm-onnx-int8")
+    parser.add_argument("--opset", type=int, default=14)
+    args = parser.parse_args()
+    export(args.output, args.opset)
@@ -0,0 +1,56 @@
+"""Command transcription batches: one bad clip or a shutdown must not strand other callers."""
+import asyncio
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("numpy")
+
+from app.utils import deepgram
+from app.utils.asr_batcher import TranscriptionBatcher
+
+
+class FakeMel:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_undecodable_clip_only_fails_its_own_result(monkeypatch):
+    model = types.SimpleNamespace()
+    fake_whisper = types.SimpleNamespace(
+        decode=lambda model, stacked, options: [types.SimpleNamespace(text=f" {mel.name} ") for mel in stacked]
+    )
+    monkeypatch.setattr(deepgram.whisper_model, "get", lambda: model)
+    monkeypatch.setattr(deepgram, "import_whisper", lambda: fake_whisper)
+    monkeypatch.setattr(deepgram, "whisper", fake_whisper)
+    monkeypatch.setattr(deepgram, "command_decoding_options", lambda *args: None)
+    monkeypatch.setitem(sys.modules, "torch", types.SimpleNamespace(stack=list))
+
+    def command_mel(model, audio):
+        if audio == "corrupt":
+            raise RuntimeError("ffmpeg could not decode")
+        return FakeMel(audio), 1.0
+
+    monkeypatch.setattr(deepgram, "command_mel", command_mel)
+
+    results = deepgram.transcribe_command_batch(["open camera", "corrupt", "read news"])
+
+    assert results[0] == {"transcript": "open camera"}
+    assert "error" in results[1]
+    assert results[2] == {"transcript": "read news"}
+
+
+def test_close_fails_queued_requests():
+    async def scenario():
+        batcher = TranscriptionBatcher(max_batch_size=8, window_ms=10_000)
+        # Collecting for a long window: both requests sit in the batcher
+        first = asyncio.create_task(batcher.transcribe("a"))
+        second = asyncio.create_task(batcher.transcribe("b"))
+        await asyncio.sleep(0.05)
+        batcher.close()
+        return await asyncio.wait_for(asyncio.gather(first, second, return_exceptions=True), 1)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
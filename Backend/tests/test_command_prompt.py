@@ -0,0 +1,51 @@
+"""The command vocabulary prompt must fit Whisper's prompt window, most important terms first."""
+import re
+import types
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("numpy")
+
+from app.utils import deepgram
+from app.utils.audio import NAVIGATION_TRIGGERS
+from app.utils.deepgram import build_command_prompt, command_prompt_terms, prompt_token_count
+
+
+class WordTokenizer:
+    """One token per word or punctuation mark"""
+
+    def encode(self, text):
+        return re.findall(r"[\w']+|[^\w\s]", text)
+
+
+def test_terms_start_with_the_navigation_triggers():
+    terms = command_prompt_terms()
+    assert terms[:len(NAVIGATION_TRIGGERS)] == [trigger.lower() for trigger in NAVIGATION_TRIGGERS]
+    assert len(terms) == len(set(terms))
+
+
+def test_prompt_stays_within_the_budget():
+    tokenizer = WordTokenizer()
+    prompt = build_command_prompt(tokenizer, 40)
+
+    assert prompt.startswith("Voice commands: switch to, go to,")
+    assert prompt_token_count(tokenizer, prompt) == 40
+    # One more term would not have fitted
+    assert len(prompt[len("Voice commands: "):-1].split(", ")) < len(command_prompt_terms())
+
+
+def test_budget_too_small_for_any_command():
+    with pytest.raises(ValueError):
+        build_command_prompt(WordTokenizer(), 3)
+
+
+def test_whisper_prompt_token_count(monkeypatch):
+    whisper = pytest.importorskip("whisper")
+    monkeypatch.setattr(deepgram, "whisper", whisper)
+    model = types.SimpleNamespace(is_multilingual=False, num_languages=99, dims=types.SimpleNamespace(n_text_ctx=448))
+
+    prompt = deepgram.command_vocabulary_prompt(model)
+
+    # Pinned: triggers and one or two aliases per feature, well under Whisper's 223-token window
+    assert prompt_token_count(whisper.tokenizer.get_tokenizer(False), prompt) == 63
@@ -0,0 +1,111 @@
+"""Article fetching: per-domain limits, cache revalidation and which URLs may be fetched."""
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("dotenv")
+
+from app.article_reading import fetcher as fetcher_module
+from app.article_reading.fetcher import ArticleFetcher, is_public_http_url
+from app.article_reading.news_cache import NewsCache
+
+
+def parse(url, html):
+    return {"title": html, "url": url}
+
+
+async def parse_inline(fn, *args):
+    return fn(*args)
+
+
+class FakeClient:
+    """Serves `pages[url]` as (status, body, headers) and records request headers"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    async def get(self, url, headers=None):
+        self.requests.append((url, headers or {}))
+        await asyncio.sleep(0)
+        status, body, response_headers = self.pages[url]
+        return httpx.Response(status, text=body, headers=response_headers, request=httpx.Request("GET", url))
+
+
+@pytest.fixture(autouse=True)
+def inline_parse(monkeypatch):
+    monkeypatch.setattr(fetcher_module, "run_cpu_bound", parse_inline)
+
+
+def make_fetcher(client, cache=None):
+    fetcher = ArticleFetcher(concurrency=4, per_domain=1, url_timeout_seconds=5, cache=cache)
+    fetcher._client = client
+    return fetcher
+
+
+def test_domain_semaphores_are_released_once_idle():
+    pages = {f"https://site{i % 3}.example/{i}": (200, f"article {i}", {}) for i in range(9)}
+    fetcher = make_fetcher(FakeClient(pages))
+
+    articles = asyncio.run(fetcher.fetch_first(list(pages), parse, limit=9))
+
+    assert len(articles) == 9
+    assert fetcher._domains == {}
+    assert fetcher.stats()["active_domains"] == 0
+
+
+def test_not_modified_reuses_the_cached_article(tmp_path):
+    url = "https://news.example/story"
+    # TTL 0: every cached entry is stale and must be revalidated
+    cache = NewsCache(str(tmp_path / "news.sqlite"), search_ttl_seconds=60, article_ttl_seconds=0, max_articles=10)
+    cached = {"title": "cached story", "url": url}
+    cache.store_article(url, cached, etag='"v1"', last_modified="Mon, 12 Oct 2026 08:00:00 GMT")
+    client = FakeClient({url: (304, "", {"ETag": '"v1"'})})
+    fetcher = make_fetcher(client, cache)
+
+    article = asyncio.run(fetcher.fetch(url, parse))
+
+    assert article == cached
+    assert cache.stats()["revalidated"] == 1
+    assert fetcher.stats()["failed"] == 0
+    assert client.requests[0][1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 12 Oct 2026 08:00:00 GMT"}
+
+
+def test_changed_article_is_parsed_and_cached_again(tmp_path):
+    url = "https://news.example/story"
+    cache = NewsCache(str(tmp_path / "news.sqlite"), search_ttl_seconds=60, article_ttl_seconds=0, max_articles=10)
+    cache.store_article(url, {"title": "old story", "url": url}, etag='"v1"')
+    fetcher = make_fetcher(FakeClient({url: (200, "new story", {"ETag": '"v2"'})}), cache)
+
+    article = asyncio.run(fetcher.fetch(url, parse))
+
+    assert article == {"title": "new story", "url": url}
+    assert cache.article(url)["etag"] == '"v2"'
+    assert cache.stats()["revalidated"] == 0
+
+
+@pytest.mark.parametrize("url, allowed", [
+    ("https://93.184.216.34/story", True),
+    ("http://93.184.216.34:8080/story", True),
+    ("ftp://93.184.216.34/story", False),
+    ("file:///etc/passwd", False),
+    ("http://localhost:8000/health", False),
+    ("http://127.0.0.1/", False),
+    ("http://10.0.0.5/admin", False),
+    ("http://169.254.169.254/latest/meta-data/", False),
+    ("http://[::1]/", False),
+    ("http://93.184.216.34:notaport/", False),
+])
+def test_only_public_http_urls_are_fetchable(url, allowed):
+    assert is_public_http_url(url) is allowed
+
+
+def test_only_returned_articles_are_known(tmp_path):
+    cache = NewsCache(str(tmp_path / "news.sqlite"), search_ttl_seconds=60, article_ttl_seconds=60, max_articles=10)
+    cache.store_article("https://news.example/story", {"title": "story", "url": "https://news.example/story"})
+    cache.store_article("https://news.example/video", None)
+
+    assert cache.has_article("https://news.example/story")
+    assert not cache.has_article("https://news.example/video")
+    assert not cache.has_article("http://169.254.169.254/latest/meta-data/")
@@ -0,0 +1,72 @@
+"""Vision answer caching: which tasks reuse answers, and what they are keyed on."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from app.all_task import pipeline
+from app.utils.cache import LRUCache
+from app.utils.frame_cache import FrameCache
+
+FRAME_HASH = 0b1011_0110
+NEARBY_HASH = FRAME_HASH ^ 0b111  # 3 bits away
+
+
+class FakeFrame:
+    def __init__(self, dhash):
+        self.dhash = dhash
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    frames = FrameCache(max_distance=6, maxsize=16, task_max_distance={"text_recognition": 1})
+    products = LRUCache(16)
+    monkeypatch.setattr(pipeline, "vision_frame_cache", frames)
+    monkeypatch.setattr(pipeline, "product_answer_cache", products)
+    return frames, products
+
+
+def lookup(query, task, frame=None, product=None):
+    return asyncio.run(pipeline.lookup_cached_answer(query, task, frame, product))
+
+
+def remember(query, task, answer, frame=None, product=None):
+    async def scenario():
+        _, store = await pipeline.lookup_cached_answer(query, task, frame, product)
+        await store(answer)
+
+    asyncio.run(scenario())
+
+
+def test_text_recognition_needs_a_near_exact_frame(caches):
+    frames, _ = caches
+    frames.store("text_recognition", "read", FRAME_HASH, "page one")
+    frames.store("image_captioning", "describe", FRAME_HASH, "a desk")
+
+    assert frames.lookup("text_recognition", "read", FRAME_HASH ^ 1) == "page one"
+    assert frames.lookup("text_recognition", "read", NEARBY_HASH) is None
+    assert frames.lookup("image_captioning", "describe", NEARBY_HASH) == "a desk"
+
+
+def test_distance_estimation_is_never_cached(caches):
+    assert lookup("how far", "distance_estimation", FakeFrame(FRAME_HASH)) == (None, None)
+
+
+def test_product_answers_are_keyed_on_the_barcode(caches):
+    _, products = caches
+    scan = (["9780131103627"], {"title": "The C Programming Language"})
+    remember("what is this", "product_recognition", "A classic book.", FakeFrame(FRAME_HASH), scan)
+
+    # A different frame and question of the same product is a hit
+    answer, store = lookup("tell me more", "product_recognition", FakeFrame(~FRAME_HASH), scan)
+    assert (answer, store) == ("A classic book.", None)
+    # Another barcode is not
+    other = (["9780262033848"], {"title": "Introduction to Algorithms"})
+    assert lookup("what is this", "product_recognition", FakeFrame(FRAME_HASH), other)[0] is None
+    assert len(products) == 1
+
+
+def test_failed_product_lookups_are_not_cached(caches):
+    assert lookup("what is this", "product_recognition", FakeFrame(FRAME_HASH), (["123"], None)) == (None, None)
+    assert lookup("what is this", "product_recognition", FakeFrame(FRAME_HASH), ([], None)) == (None, None)
@@ -0,0 +1,77 @@
+"""KeywordAutomaton against the naive `keyword in text` scans it replaced."""
+import random
+
+import pytest
+
+from app.utils.keyword_matcher import KeywordAutomaton
+
+
+def naive_first(patterns, text):
+    """The old routing loop: first label, then first keyword, that occurs as a substring"""
+    text = text.lower()
+    for priority, (pattern, payload) in enumerate(patterns):
+        if pattern.lower() in text:
+            return priority, payload
+    return None
+
+
+def naive_all(patterns, text):
+    text = text.lower()
+    hits = set()
+    for priority, (pattern, _) in enumerate(patterns):
+        pattern = pattern.lower()
+        start = text.find(pattern)
+        while start != -1:
+            hits.add((start, start + len(pattern), priority))
+            start = text.find(pattern, start + 1)
+    return hits
+
+
+def test_matches_naive_scan_on_random_text():
+    rng = random.Random(1234)
+    alphabet = "ab c"
+    for _ in range(300):
+        patterns = [("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))), i) for i in range(rng.randint(1, 8))]
+        patterns = [(p, payload) for p, payload in patterns if p.strip()]
+        if not patterns:
+            continue
+        automaton = KeywordAutomaton(patterns)
+        text = "".join(rng.choice(alphabet + "AB") for _ in range(rng.randint(0, 30)))
+
+        match = automaton.first(text)
+        expected = naive_first(patterns, text)
+        assert (None if match is None else (match.priority, match.payload)) == expected, (patterns, text)
+        assert {(m.start, m.end, m.priority) for m in automaton.iter_matches(text)} == naive_all(patterns, text)
+
+
+def test_first_label_then_first_keyword_wins():
+    # Flattened like label_keyword_matcher: labels in table order, keywords in list order
+    table = {"Text": ["read text", "text"], "News": ["news", "read"], "Music": ["song", "news music"]}
+    patterns = [(keyword, label) for label, keywords in table.items() for keyword in keywords]
+    automaton = KeywordAutomaton(patterns)
+
+    # "read" (News) ends before "read text" (Text), but Text is listed first
+    assert automaton.first("please read text now").payload == "Text"
+    assert automaton.first("please read text now").pattern == "read text"
+    # Both News keywords present: "news" comes before "read" in News' list
+    assert automaton.first("read the news").pattern == "news"
+    # "news music" (Music) loses to "news" (News), which is listed earlier
+    assert automaton.first("play news music").payload == "News"
+    assert automaton.first("nothing here") is None
+
+
+def test_word_boundary_option():
+    automaton = KeywordAutomaton([("read", "News")])
+    assert automaton.first("bread") is not None
+    assert automaton.first("bread", word_boundary=True) is None
+    assert automaton.first("read it", word_boundary=True).payload == "News"
+
+
+def test_navigation_trigger_followed_by_whitespace():
+    pytest.importorskip("dotenv")
+    pytest.importorskip("numpy")
+    from app.utils.audio import find_navigation_intent
+
+    # The old regex appended a literal "\s+", so explicit triggers never matched
+    assert find_navigation_intent("go to news please")["target_feature"] == "News"
+    assert find_navigation_intent("switch to text reading")["target_feature"] == "Text"
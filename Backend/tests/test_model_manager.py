@@ -0,0 +1,42 @@
+"""Model registry: idle evictable models are unloaded under a memory budget and reload on use."""
+import pytest
+
+pytest.importorskip("dotenv")
+
+from app.utils.model_manager import ModelRegistry
+
+
+class Weights:
+    def __init__(self, mb):
+        self.mb = mb
+
+
+def sized(mb):
+    return lambda: Weights(mb)
+
+
+def test_idle_evictable_model_is_unloaded_and_reloaded(monkeypatch):
+    monkeypatch.setattr("app.utils.model_manager.model_memory_bytes", lambda model: model.mb * 2**20)
+    registry = ModelRegistry(memory_budget_bytes=150 * 2**20, idle_seconds=0)
+    pinned = registry.register("whisper", sized(100), evictable=False)
+    embedder = registry.register("embedder", sized(80), evictable=True)
+
+    embedder.get()
+    pinned.get()  # Loading goes over budget: the idle embedder is unloaded
+
+    assert pinned.is_loaded
+    assert not embedder.is_loaded
+    assert registry.evictions == 1
+
+    first_version = embedder.version
+    assert isinstance(embedder.get(), Weights)
+    assert embedder.version == first_version + 1
+
+
+def test_nothing_is_unloaded_without_a_budget(monkeypatch):
+    monkeypatch.setattr("app.utils.model_manager.model_memory_bytes", lambda model: model.mb * 2**20)
+    registry = ModelRegistry(memory_budget_bytes=0, idle_seconds=0)
+    embedder = registry.register("embedder", sized(80), evictable=True)
+    embedder.get()
+    registry.register("whisper", sized(100)).get()
+    assert embedder.is_loaded
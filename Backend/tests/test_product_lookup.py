@@ -0,0 +1,65 @@
+"""Product lookups: one Google Books request per ISBN, failures retried."""
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("dotenv")
+
+from app.all_task.product_recognition import ProductLookupService
+from app.config import config
+
+VOLUME = {"items": [{"volumeInfo": {"title": "The C Programming Language", "authors": ["Kernighan", "Ritchie"]}}]}
+
+
+class FakeClient:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = 0
+
+    async def get(self, url, params=None):
+        self.requests += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return httpx.Response(response[0], json=response[1], request=httpx.Request("GET", url, params=params))
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PRODUCT_SAMPLE_FALLBACK", False)
+    return ProductLookupService(str(tmp_path / "products.sqlite"), ttl_seconds=60, negative_ttl_seconds=60, timeout_seconds=1)
+
+
+def lookups(service, client, *isbns):
+    service._client = client
+
+    async def scenario():
+        return [await service.alookup(isbn) for isbn in isbns]
+
+    return asyncio.run(scenario())
+
+
+def test_found_products_are_served_from_the_cache(service):
+    client = FakeClient((200, VOLUME))
+    first, second = lookups(service, client, "9780131103627", "9780131103627")
+    assert first == second
+    assert first["title"] == "The C Programming Language"
+    assert client.requests == 1
+    assert service.stats()["cache_hits"] == 1
+
+
+def test_unknown_products_are_cached_as_not_found(service):
+    client = FakeClient((200, {"totalItems": 0}))
+    assert lookups(service, client, "123", "123") == [None, None]
+    assert client.requests == 1
+    assert service.stats()["negative_hits"] == 1
+
+
+def test_failed_fetches_are_retried(service):
+    client = FakeClient(httpx.ConnectError("offline"), (503, {}), (200, VOLUME))
+    first, second, third = lookups(service, client, "9780131103627", "9780131103627", "9780131103627")
+    assert first is None and second is None
+    assert third["title"] == "The C Programming Language"
+    assert service.stats()["fetch_errors"] == 2
+    assert service.stats()["fetches"] == 3
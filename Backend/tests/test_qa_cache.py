@@ -0,0 +1,45 @@
+"""A failing QA cache must not fail the question: the LLM answers uncached."""
+import asyncio
+import types
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("numpy")
+
+from app.all_task import pipeline
+
+
+class BrokenCache:
+    enabled = True
+
+    def __init__(self, lookup_error=None, store_error=None):
+        self.lookup_error = lookup_error
+        self.store_error = store_error
+
+    def lookup(self, question):
+        if self.lookup_error:
+            raise self.lookup_error
+        return types.SimpleNamespace(answer=None, similarity=0.0, vector=None)
+
+    def store(self, question, answer, vector=None):
+        raise self.store_error
+
+
+def test_lookup_errors_fall_through_to_the_llm(monkeypatch):
+    monkeypatch.setattr(pipeline, "qa_response_cache", BrokenCache(lookup_error=RuntimeError("embedder evicted")))
+    result = asyncio.run(pipeline.lookup_cached_answer("what time is it", "general_question_answering"))
+    assert result == (None, None)
+
+
+def test_store_errors_are_swallowed(monkeypatch):
+    import sqlite3
+
+    monkeypatch.setattr(pipeline, "qa_response_cache", BrokenCache(store_error=sqlite3.OperationalError("database is locked")))
+
+    async def scenario():
+        answer, remember = await pipeline.lookup_cached_answer("what time is it", "general_question_answering")
+        assert answer is None
+        await remember("Noon.")
+
+    asyncio.run(scenario())
@@ -0,0 +1,38 @@
+"""SSE answer streams: sentence events as they complete, generic error details."""
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from app.utils.sse import llm_sse_events
+
+
+def collect(tokens):
+    async def scenario():
+        return [event async for event in llm_sse_events(tokens)]
+
+    events = []
+    for raw in asyncio.run(scenario()):
+        name, data = raw.strip().split("\n")
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+async def chunks(*parts, error=None):
+    for part in parts:
+        yield part
+    if error is not None:
+        raise error
+
+
+def test_sentences_are_sent_as_they_complete():
+    events = collect(chunks("Hello there. How ", "are you? Fine"))
+    assert [data["text"] for name, data in events if name == "sentence"] == ["Hello there.", "How are you?", "Fine"]
+    assert events[-1] == ("done", {"text": "Hello there. How are you? Fine"})
+
+
+def test_errors_do_not_leak_exception_text():
+    events = collect(chunks("Partial", error=RuntimeError("secret upstream detail")))
+    assert events[-1] == ("error", {"detail": "Failed to generate a response"})
@@ -0,0 +1,33 @@
+"""Readiness: the app is only ready when every required warm-up step succeeded."""
+import asyncio
+
+from app.utils.startup import StartupReport
+
+
+def boom():
+    raise RuntimeError("weights missing")
+
+
+def run_warm_up(report, warm_up):
+    async def scenario():
+        task = asyncio.create_task(asyncio.to_thread(warm_up))
+        report.track(task)
+        await task
+        await asyncio.sleep(0)  # Let the done callback run
+
+    asyncio.run(scenario())
+
+
+def test_failed_required_step_keeps_app_not_ready():
+    report = StartupReport()
+    run_warm_up(report, lambda: (report.step("nltk data", lambda: None), report.step("load whisper", boom, required=True)))
+    assert not report.ready
+    assert report.failed_steps() == ["load whisper"]
+
+
+def test_failed_optional_step_does_not_block_readiness():
+    report = StartupReport()
+    run_warm_up(report, lambda: (report.step("llm client", boom), report.step("load whisper", lambda: None, required=True)))
+    assert report.ready
+    assert report.failed_steps() == []
+    assert report.snapshot()["steps"]["llm client"]["status"] == "failed"
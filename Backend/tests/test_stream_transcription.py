@@ -0,0 +1,29 @@
+"""Streaming transcription: a malformed audio frame must not end the session."""
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("numpy")
+pytest.importorskip("multipart")
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def test_partial_sample_frame_is_dropped_without_closing_the_stream():
+    with TestClient(app).websocket_connect("/ws/transcribe_audio") as websocket:
+        assert websocket.receive_json()["type"] == "ready"
+
+        websocket.send_bytes(b"\x00\x01\x02")  # 1.5 int16 samples
+        error = websocket.receive_json()
+        assert error["type"] == "error"
+        assert "frame dropped" in error["detail"]
+
+        # The session is still usable: switch to float32 and send whole samples
+        websocket.send_text(json.dumps({"encoding": "pcm_f32le"}))
+        websocket.send_bytes(b"\x00" * 6)
+        error = websocket.receive_json()
+        assert "4-byte samples" in error["detail"]
+        websocket.send_bytes(b"\x00" * 1600)  # 400 silent samples
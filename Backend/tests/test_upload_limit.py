@@ -0,0 +1,63 @@
+"""Oversized audio uploads are refused before their body is received."""
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("numpy")
+pytest.importorskip("multipart")
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.utils.audio_io import MULTIPART_OVERHEAD_BYTES, UploadSizeLimit
+
+MAX_BYTES = 1024
+
+
+def make_client():
+    app = FastAPI()
+    app.state.calls = 0
+    app.add_middleware(UploadSizeLimit, paths={"/upload"}, max_bytes=MAX_BYTES)
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        app.state.calls += 1
+        return {"size": len(await file.read())}
+
+    @app.post("/other")
+    async def other(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return app, TestClient(app)
+
+
+def test_small_uploads_pass():
+    app, client = make_client()
+    response = client.post("/upload", files={"file": ("a.webm", b"x" * MAX_BYTES)})
+    assert response.status_code == 200
+    assert response.json() == {"size": MAX_BYTES}
+
+
+def test_oversized_content_length_is_refused_before_the_endpoint():
+    app, client = make_client()
+    response = client.post("/upload", files={"file": ("a.webm", b"x" * (MAX_BYTES + MULTIPART_OVERHEAD_BYTES + 1))})
+    assert response.status_code == 413
+    assert app.state.calls == 0
+
+
+def test_oversized_chunked_body_is_cut_off():
+    app, client = make_client()
+
+    def body():
+        # No Content-Length: the limit applies as the chunks arrive
+        for _ in range(100):
+            yield b"x" * MULTIPART_OVERHEAD_BYTES
+
+    response = client.post("/upload", content=body(), headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+    assert app.state.calls == 0
+
+
+def test_other_paths_are_not_limited():
+    app, client = make_client()
+    response = client.post("/other", files={"file": ("a.webm", b"x" * (MAX_BYTES + MULTIPART_OVERHEAD_BYTES + 1))})
+    assert response.status_code == 200